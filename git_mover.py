@@ -5,8 +5,17 @@
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 import sys
 import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 import movers.args
 import movers.repo
+import movers.mirror
+import movers.bundle
+import movers.lfs
+import movers.issues
+import movers.manifest
 from movers.exceptions import GitMoverApiCallError
 
 
@@ -27,6 +36,7 @@ def _define_verbose_print(is_verbose_exec:bool=False):
 
     This function will either define a "non-op" function for the variable `vprint`, or will define a simple
     pass-through print function (where all of the args to `vprint` are simply passed on to an execution of `print`).
+    The same function is also given to the `movers` modules that print verbose output.
     """
     if is_verbose_exec:
         def _v_print(*sargs, **kwargs):
@@ -35,6 +45,440 @@ def _define_verbose_print(is_verbose_exec:bool=False):
         _v_print = lambda *a: None  # do-nothing function
     global vprint
     vprint = _v_print
+    movers.repo.vprint = _v_print
+    movers.mirror.vprint = _v_print
+    movers.bundle.vprint = _v_print
+    movers.lfs.vprint = _v_print
+    movers.issues.vprint = _v_print
+#END DEF
+
+def _requested_github_data_types(args) -> list:
+    """Gets the types of Github data requested with the `--githubData` option.
+
+    Arguments:
+        args (argparse.Namespace): The validated arguments of this script.
+
+    Returns:
+        list: The requested items of `movers.args.GITHUB_DATA_TYPES`, in order. Empty if the option was not used.
+    """
+    if 'githubData' not in args:
+        return []
+    return [gdt for gdt in movers.args.GITHUB_DATA_TYPES if args.githubData == '' or gdt in args.githubData]
+#END DEF
+
+def _requested_actions(args) -> list:
+    """Gets everything that was requested for each repository: 'clone' and the requested types of Github data.
+
+    Arguments:
+        args (argparse.Namespace): The validated arguments of this script.
+
+    Returns:
+        list: 'clone' if `--clone` was used, followed by the result of `_requested_github_data_types`.
+    """
+    return (['clone'] if args.clone else []) + _requested_github_data_types(args)
+#END DEF
+
+def _describe_exception(e:Exception) -> str:
+    """Describes an exception in one line, including the exception it was raised from (if any).
+
+    Arguments:
+        e (Exception): The exception.
+
+    Returns:
+        str: The exception's message, followed by its cause's (eg. the HTTP response of a failed API call).
+    """
+    def _describe(exc):
+        #`GitMoverApiCallError` already starts its message with its name
+        text = str(exc)
+        return text if text.startswith(type(exc).__name__) else "{}: {}".format(type(exc).__name__, text)
+    description = _describe(e)
+    if e.__cause__ is not None:
+        description += " (caused by {})".format(_describe(e.__cause__))
+    return description
+#END DEF
+
+def _replay_github_data(
+        gdt:str, downloaded_data, drepo:str, dhost:str, dcreds:tuple,
+        state_dir:str=None, created_repo:bool=False
+) -> str:
+    """Creates one type of downloaded Github data on one destination repository.
+
+    Arguments:
+        gdt (str): The type of Github data (one of `movers.args.GITHUB_DATA_TYPES`).
+        downloaded_data (object): The data returned by the matching download function
+            (see `movers.repo.get_github_data_function`).
+        drepo (str): The destination repository.
+        dhost (str): The destination Github Host.
+        dcreds (tuple): The credentials for the destination Github Host.
+        state_dir (str): The directory to keep source-to-destination ID mappings in. Default=None
+        created_repo (bool): Whether the destination repository was created by this run. Default=False
+
+    Returns:
+        str: None if the data was created. If not, the reason why.
+
+    When the data cannot be created, a destination repository created by this run is deleted (along with its
+    ID mappings), unless the data is one of the ISSUES_GITHUB_DATA_TYPES. Their progress is kept in `state_dir`,
+    so running the same command again resumes them instead. A repository that existed before the run is never deleted.
+    """
+    github_create_function = movers.repo.get_github_data_function('create', gdt)
+    try:
+        vprint("----- Uploading {} data to destination repository on {}".format(gdt, dhost))
+        creation_successful = github_create_function(downloaded_data, drepo, dhost, dcreds, state_dir=state_dir)
+        if creation_successful:
+            return None
+        print("+++ Failed to successfully create {} data on {}.".format(gdt, dhost))
+        error = "Failed to create {} data on {}: the data was invalid.".format(gdt, dhost)
+    except (Exception) as e:
+        print("+++ Error while creating {} data on {}.".format(gdt, dhost))
+        vprint("----- Error encountered | {}".format(e))
+        error = "Error while creating {} data on {}. {}".format(gdt, dhost, _describe_exception(e))
+    #END TRY/EXCEPT
+
+    if gdt in movers.args.ISSUES_GITHUB_DATA_TYPES:
+        print(
+            "+++ Keeping the destination repository and the progress made. To resume, run the same command again "+
+            "with `--githubData` (without `--clone`) and `--stateDir {}`.".format(state_dir)
+        )
+    elif created_repo:
+        print("+++ Deleting partial repository from destination.")
+        movers.repo._delete_repo(drepo, dhost, dcreds)
+        movers.issues.clear_state(state_dir, drepo, dhost)
+    #END IF/ELIF
+    return error
+#END DEF
+
+def _process_repository(srepo:str, drepo:str, args, all_credentials:dict) -> tuple:
+    """Clones and/or copies the Github data of one source repository to every destination.
+
+    Arguments:
+        srepo (str): The source repository.
+        drepo (str): The destination repository (created on every destination host).
+        args (argparse.Namespace): The validated arguments of this script.
+        all_credentials (dict): The credentials for the source, and a list of credentials for the destinations.
+
+    Returns:
+        tuple: (exit_code, error)
+            exit_code (int): 0 on success, or the exit code `main` should return (see `main`).
+            error (str): None on success, or the reason the repository failed.
+
+    The source repository is cloned once, and its Github data is downloaded once. Both are then pushed/replayed
+    to all of the destinations in parallel. With `--import`, both are read from the export directory instead.
+    """
+    destinations = list(zip(args.destinationHost, all_credentials['dst']))
+    exported_data = None
+    if args.importDir is not None:
+        if movers.bundle.is_imported(args.importDir, drepo, args.destinationHost, _requested_actions(args)):
+            print("+++ '{}' was already imported to every destination with the same options. Skipping...".format(drepo))
+            return 0, None
+        try:
+            vprint("--- Verifying exported files of '{}'".format(srepo))
+            exported_data, bundle_path = movers.bundle.load_export(srepo, args.importDir)
+        except (Exception) as e:
+            print("+++ Unable to load the export of '{}'.".format(srepo))
+            vprint("--- Exception | {}".format(e))
+            return 6, "Unable to load the export of '{}'. {}".format(srepo, _describe_exception(e))
+        #END TRY/EXCEPT
+    #END IF
+    vprint("--- '{}' on {} being moved to '{}' on {}".format(srepo, args.sourceHost, drepo, ', '.join(args.destinationHost)))
+
+    #Testing to see if the Destination Repository already exists
+    drepo_infos = []
+    for dhost, dcreds in destinations:
+        vprint("--- Testing if '{}' on {} already exists.".format(drepo, dhost))
+        try:
+            drepo_infos.append(movers.repo.download_repository(drepo, dhost, dcreds))
+        except (GitMoverApiCallError) as e:
+            api_res = e.get_api_response()
+            if api_res.status_code == 404:
+                vprint(
+                    "--- API Response from function `movers.repo.download_repository` gave HTTP response code 404. "+
+                    "Destination Repository does not exist. Safe to continue."
+                )
+                drepo_infos.append(None)
+            else:
+                print("+++ Unable to determine if destination repo does or does not already exist on {}.".format(dhost))
+                vprint("--- GitMoverApiCallError | {} ; {} ; {}".format(e, api_res.status_code, api_res.text))
+                return 3, "Unable to determine if the destination repository exists on {}. {}".format(dhost, _describe_exception(e))
+        #END TRY/EXCEPT
+    #END FOR
+
+    if args.clone:
+        if any([info is not None for info in drepo_infos]):
+            print("+++ The destination repository already exists. Please delete it or only use the `--githubData` option.")
+            return 3, "The destination repository already exists."
+        vprint("--- Cloning source repo to destination")
+        if exported_data is not None:
+            srepo_info = exported_data['repository']
+        else:
+            vprint("----- Downloading info on source repo")
+            try:
+                srepo_info = movers.repo.download_repository(srepo, args.sourceHost, all_credentials['src'])
+            except (Exception) as e:
+                print("+++ Unable to download info on the source repository.")
+                vprint("--- Exception | {}".format(e))
+                return 3, "Unable to download info on the source repository. {}".format(_describe_exception(e))
+            #END TRY/EXCEPT
+        if srepo_info.archived or srepo_info.disabled:
+            print("+++ The source repository has been archived or disabled. Skipping...")
+            return 0, None
+        try:
+            vprint("----- Creating new blank destination repo(s)")
+            drepo_infos = [
+                movers.repo.create_repository(srepo_info, drepo, dhost, dcreds)
+                for dhost, dcreds in destinations
+            ]
+            vprint("----- Cloning source repo commits/code/tags/etc. to destination(s)")
+            destination_clone_urls = [info.clone_url for info in drepo_infos]
+            if exported_data is not None:
+                push_successful = movers.bundle.push_bundle(bundle_path, destination_clone_urls, all_credentials['dst'])
+            else:
+                do_repack = args.repackThreshold is not None and srepo_info.size >= args.repackThreshold
+                push_successful = movers.repo.clone_repository(
+                    srepo_info.clone_url, destination_clone_urls, all_credentials,
+                    object_store=args.objectStore, repack=do_repack, repack_threads=args.repackThreads,
+                    lfs_cache=args.lfsCache if args.lfs else None, lfs_workers=args.lfsWorkers,
+                    wiki=srepo_info.has_wiki,
+                )
+            if not push_successful:
+                raise RuntimeError("Failed to push the cloned repository to every destination.")
+        except (Exception) as e:
+            print("+++ Failed to clone source repository's codebase to destination repository.")
+            vprint("--- Exception | {}".format(e))
+            return 3, "Failed to clone the source repository to the destination. {}".format(_describe_exception(e))
+        #END TRY/EXCEPT
+    #END IF
+
+    if 'githubData' in args:
+        if any([info is None for info in drepo_infos]):
+            print("+++ The destination repository does not exist. Please create it manually or use the `--clone` option.")
+            return 4, "The destination repository does not exist."
+        for gdt in _requested_github_data_types(args):
+            vprint("--- Copying source repository's {} data to destination(s)".format(gdt))
+            if exported_data is not None:
+                if gdt not in exported_data:
+                    print("+++ The export of '{}' does not contain {} data.".format(srepo, gdt))
+                    return 4, "The export of '{}' does not contain {} data.".format(srepo, gdt)
+                downloaded_data = exported_data[gdt]
+            else:
+                github_download_function = movers.repo.get_github_data_function('download', gdt)
+                try:
+                    vprint("----- Downloading source repository's {} data".format(gdt))
+                    downloaded_data = github_download_function(srepo, args.sourceHost, all_credentials['src'])
+                except (Exception) as e:
+                    print("+++ Error while downloading {} data.".format(gdt))
+                    vprint("----- Error encountered | {}".format(e))
+                    return 4, "Error while downloading {} data. {}".format(gdt, _describe_exception(e))
+                #END TRY/EXCEPT
+            #END IF/ELSE
+
+            spool_path = None
+            if gdt in movers.args.STREAMED_GITHUB_DATA_TYPES and len(destinations) > 1:
+                #A stream can only be read once, so it is written to disk and every destination reads it back
+                spool_fd, spool_path = tempfile.mkstemp(suffix='.jsonl')
+                os.close(spool_fd)
+                try:
+                    vprint("----- Writing source repository's {} data to '{}'".format(gdt, spool_path))
+                    movers.issues.spool_items(downloaded_data, spool_path)
+                except (Exception) as e:
+                    print("+++ Error while downloading {} data.".format(gdt))
+                    vprint("----- Error encountered | {}".format(e))
+                    os.remove(spool_path)
+                    return 4, "Error while downloading {} data. {}".format(gdt, _describe_exception(e))
+                #END TRY/EXCEPT
+            #END IF
+            try:
+                with ThreadPoolExecutor(max_workers=len(destinations)) as executor:
+                    replay_errors = list(executor.map(
+                        lambda dest: _replay_github_data(
+                            gdt,
+                            downloaded_data if spool_path is None else movers.issues.read_spooled_items(spool_path),
+                            drepo, dest[0], dest[1], state_dir=args.stateDir, created_repo=args.clone,
+                        ),
+                        destinations,
+                    ))
+            finally:
+                if spool_path is not None:
+                    os.remove(spool_path)
+            #END TRY/FINALLY
+            replay_errors = [error for error in replay_errors if error is not None]
+            if replay_errors:
+                return 4, ' '.join(replay_errors)
+        #END FOR
+    #END IF
+    if args.importDir is not None:
+        movers.bundle.mark_imported(args.importDir, drepo, args.destinationHost, _requested_actions(args))
+    print("+++ Successfully created data in new destination repository")
+    return 0, None
+#END DEF
+
+def _timestamp(seconds:float) -> str:
+    """Formats a time as an ISO 8601 UTC timestamp (eg. '2024-01-31T12:00:00Z').
+
+    Arguments:
+        seconds (float): The time, as returned by `time.time`.
+
+    Returns:
+        str: The formatted time.
+    """
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(seconds))
+#END DEF
+
+def _process_row(row_number:int, row:dict, args, all_credentials:dict, successful:set) -> int:
+    """Processes one row of the manifest (or one pair of positional repositories). Returns a Bash Shell exit code.
+
+    Arguments:
+        row_number (int): The number of the row, starting at 1.
+        row (dict): The row, as given by `movers.manifest.iter_rows`.
+        args (argparse.Namespace): The validated arguments of this script.
+        all_credentials (dict): The credentials for the source, and a list of credentials for the destinations.
+        successful (set): The (source_repo, destination_repo) pairs to skip, as they already succeeded.
+
+    Returns:
+        int: 0 on success, or the exit code `main` should return (see `main`).
+
+    With `--results`, the row's outcome, timing and error are appended to the results file as soon as it is done.
+    """
+    started_at = time.time()
+    result = {'row': row_number, 'source_repo': row.get('source_repo'), 'destination_repo': row.get('destination_repo')}
+    try:
+        entry = movers.manifest.parse_row(row)
+        row_args, row_credentials = movers.manifest.get_row_arguments(entry, args, all_credentials)
+    except (RuntimeError) as e:
+        print("+++ Row {} is invalid. REASON: {}".format(row_number, e))
+        exit_code, error = 1, str(e)
+    else:
+        srepo, drepo = entry['source_repo'], entry['destination_repo']
+        if (srepo, drepo) in successful:
+            print("+++ '{}' --> '{}' already succeeded according to '{}'. Skipping...".format(srepo, drepo, args.results))
+            return 0
+        result.update({'source_repo': srepo, 'destination_repo': drepo, 'destination_hosts': row_args.destinationHost})
+        print("+++ Processing '{}' --> '{}'".format(srepo, drepo))
+        try:
+            exit_code, error = _process_repository(srepo, drepo, row_args, row_credentials)
+        except (Exception) as e:
+            print("+++ Unexpected error while processing '{}' --> '{}'.".format(srepo, drepo))
+            vprint("--- Exception | {}".format(e))
+            exit_code, error = 7, "Unexpected error. {}".format(_describe_exception(e))
+        #END TRY/EXCEPT
+    #END TRY/EXCEPT/ELSE
+
+    if args.results is not None:
+        finished_at = time.time()
+        result.update({
+            'outcome': movers.manifest.RESULT_SUCCESS if exit_code == 0 else movers.manifest.RESULT_FAILURE,
+            'exit_code': exit_code,
+            'error': error,
+            'started_at': _timestamp(started_at),
+            'finished_at': _timestamp(finished_at),
+            'duration_seconds': round(finished_at - started_at, 3),
+        })
+        movers.manifest.append_result(args.results, result)
+    #END IF
+    return exit_code
+#END DEF
+
+def _run_actions(args, all_credentials:dict) -> int:
+    """Runs the export, migration and/or mirror daemon requested by the arguments. Returns a Bash Shell exit code.
+
+    Arguments:
+        args (argparse.Namespace): The validated arguments of this script.
+        all_credentials (dict): The credentials for the source, and a list of credentials for the destinations.
+
+    Returns:
+        int: The command line response code for this script's execution (see `main`).
+    """
+    if args.exportDir is not None:
+        if args.manifest is not None:
+            print("+++ Exporting repositories listed in '{}' to '{}'".format(args.manifest, args.exportDir))
+        else:
+            print("+++ Exporting list of {} repositories to '{}'".format(len(args.source_repo), args.exportDir))
+        final_exit_code = 0
+        for row_number, row in movers.manifest.iter_rows(args):
+            try:
+                srepo = movers.manifest.parse_row(row)['source_repo']
+            except (RuntimeError) as e:
+                print("+++ Row {} is invalid. REASON: {}".format(row_number, e))
+                final_exit_code = final_exit_code or 1
+                continue
+            #END TRY/EXCEPT
+            print("+++ Exporting '{}'".format(srepo))
+            try:
+                exported = movers.bundle.export_repository(
+                    srepo, args.sourceHost, all_credentials['src'], args.exportDir,
+                    _requested_github_data_types(args), object_store=args.objectStore,
+                    repack_threshold=args.repackThreshold, repack_threads=args.repackThreads,
+                )
+            except (Exception) as e:
+                print("+++ Failed to export '{}'.".format(srepo))
+                vprint("--- Exception | {}".format(e))
+                if args.manifest is None:
+                    return 6
+                final_exit_code = final_exit_code or 6
+                continue
+            #END TRY/EXCEPT
+            if not exported:
+                print("+++ '{}' was already exported. Skipping...".format(srepo))
+        #END FOR
+        if final_exit_code != 0:
+            print("+++ Failed to export one or more of the repositories in the manifest.")
+            return final_exit_code
+        print("Done!")
+        return 0
+    #END IF
+
+    if args.clone or 'githubData' in args:
+        successful = movers.manifest.read_successful(args.results)
+        if args.manifest is not None:
+            print("+++ Processing repositories listed in '{}'".format(args.manifest))
+        else:
+            print("+++ Processing list of {} repositories".format(len(args.source_repo)))
+        final_exit_code = 0
+        for row_number, row in movers.manifest.iter_rows(args):
+            exit_code = _process_row(row_number, row, args, all_credentials, successful)
+            if exit_code != 0:
+                #Without a manifest, the first failure stops the script, as it always has
+                if args.manifest is None:
+                    return exit_code
+                final_exit_code = final_exit_code or exit_code
+
+            # #####
+            # #
+            # # temp code while implementing
+            # do_delete = input(">>> delete? (Y/n): ")
+            # if do_delete == '' or do_delete.lower() == 'y':
+            #     movers.repo._delete_repo(drepo, args.destinationHost, all_credentials['dst'])
+            # #
+            # #####
+        #END FOR
+        if final_exit_code != 0:
+            print("+++ Failed to process one or more of the repositories in the manifest.")
+            return final_exit_code
+    #END IF
+
+    if args.daemon:
+        mirror_root = args.mirrorDir or tempfile.mkdtemp(prefix='git_mover_mirror_')
+        vprint("--- Starting mirror daemon with local mirrors in '{}'".format(mirror_root))
+        try:
+            repo_pairs = []
+            for row_number, row in movers.manifest.iter_rows(args):
+                entry = movers.manifest.parse_row(row)
+                repo_pairs.append((entry['source_repo'], entry['destination_repo']))
+            #END FOR
+            return movers.mirror.run_daemon(
+                repo_pairs,
+                args.sourceHost, args.destinationHost, all_credentials,
+                mirror_root, poll_interval=args.pollInterval, max_workers=args.maxWorkers,
+                object_store=args.objectStore,
+            )
+        except (Exception) as e:
+            print("+++ Failed to start the mirror daemon. Please check that all destination repositories exist.")
+            vprint("--- Exception | {}".format(e))
+            return 5
+        #END TRY/EXCEPT
+    #END IF
+
+    print("Done!")
+    return 0
 #END DEF
 
 def main() -> int:
@@ -47,6 +491,12 @@ def main() -> int:
             2 = `git` not installed
             3 = Issue with creating and cloning codebase to destination repository
             4 = Issue with copying Github Data to destination repository
+            5 = Issue with starting the mirror daemon
+            6 = Issue with exporting or importing a repository's bundle
+            7 = Unexpected error while processing a repository
+
+    With `--manifest`, a repository that fails does not stop the ones after it; the exit code of the first
+    failure is returned once every row has been processed.
     """
     parser = movers.args.get_arg_parser()
     args = parser.parse_args()
@@ -59,8 +509,16 @@ def main() -> int:
     try:
         vprint("--- Validating Repository arguments")
         movers.args.validate_repo_args(args)
+        if args.manifest is not None:
+            movers.manifest.get_manifest_format(args.manifest)
         vprint("--- Validating Hosts arguments")
         movers.args.validate_hosts(args)
+        vprint("--- Validating Repack arguments")
+        movers.args.validate_repack_args(args)
+        vprint("--- Validating LFS arguments")
+        movers.args.validate_lfs_args(args)
+        vprint("--- Validating Daemon arguments")
+        movers.args.validate_daemon_args(args)
         vprint("--- Cleaning value of `githubData` argument")
         if 'githubData' in args:
             args.githubData = (args.githubData or '').replace(' ','')
@@ -69,11 +527,20 @@ def main() -> int:
         return 1
     #END TRY/EXCEPT
 
-    if not args.clone and 'githubData' not in args:
-        print('+++ Action not specified. Use of `--clone` and/or `--githubData` option is required.')
+    if args.exportDir is not None and (args.importDir is not None or args.daemon):
+        print('+++ The `--export` option cannot be used with the `--import` or `--daemon` options.')
+        return 1
+    if args.exportDir is not None and args.results is not None:
+        print('+++ The `--results` option cannot be used with the `--export` option.')
+        return 1
+    if args.importDir is not None and args.daemon:
+        print('+++ The `--import` option cannot be used with the `--daemon` option.')
+        return 1
+    if not args.clone and 'githubData' not in args and not args.daemon and args.exportDir is None:
+        print('+++ Action not specified. Use of `--clone`, `--githubData`, `--daemon` and/or `--export` option is required.')
         return 1
     #END IF
-    if args.clone:
+    if args.clone or args.daemon or args.exportDir is not None:
         cmd_git_exists = os.system("command -v git > /dev/null")
         if cmd_git_exists != 0:
             print("+++ This script needs to be able to use the 'git' command line tool. Please install 'git'.")
@@ -82,101 +549,28 @@ def main() -> int:
     vprint("--- All arguments validated")
     vprint("--- CLEANED ARG NAMESPACE | {!r}".format(args))
 
-    vprint("--- Defining HTTPS Credential pairs for source and destination.")
+    temp_lfs_cache = None
+    if args.lfs and args.lfsCache is None:
+        args.lfsCache = temp_lfs_cache = tempfile.mkdtemp(prefix='git_mover_lfs_')
+        vprint("--- Caching LFS objects in '{}'".format(args.lfsCache))
+    if args.stateDir is None and not args.daemon and args.exportDir is None:
+        #Created once, so every destination (replayed on its own thread) shares it, and it is kept for resuming
+        args.stateDir = tempfile.mkdtemp(prefix='git_mover_state_')
+        vprint("--- Keeping Milestone and Issue number mappings in '{}'".format(args.stateDir))
+
+    vprint("--- Defining HTTPS Credential pairs for source and destination(s).")
     all_credentials = {
         'src': (args.sourceUserName, args.sourceToken),
-        'dst': (args.destinationUserName, args.destinationToken),
+        'dst': list(zip(args.destinationUserName, args.destinationToken)),
     }
 
-    print("+++ Processing list of {} repositories".format(len(args.source_repo)))
-    for idx in range(len(args.source_repo)):
-        srepo = args.source_repo[idx]
-        drepo = args.destination_repo[idx]
-        print("+++ Processing '{}' --> '{}'".format(srepo, drepo))
-        vprint("--- '{}' on {} being moved to '{}' on {}".format(srepo, args.sourceHost, drepo, args.destinationHost))
-
-        #Testing to see if the Destination Repository already exists
-        vprint("--- Testing if '{}' on {} already exists.".format(drepo, args.destinationHost))
-        try:
-            drepo_info = movers.repo.download_repository(drepo, args.destinationHost, all_credentials['dst'])
-        except (GitMoverApiCallError) as e:
-            api_res = e.get_api_response()
-            if api_res.status_code == 404:
-                vprint(
-                    "--- API Response from function `movers.repo.download_repository` gave HTTP response code 404. "+
-                    "Destination Repository does not exist. Safe to continue."
-                )
-                drepo_info = None
-            else:
-                print("+++ Unable to determine if destination repo does or does not already exist.")
-                vprint("--- GitMoverApiCallError | {} ; {} ; {}".format(e, api_res.status_code, api_res.text))
-                return 3
-        #END TRY/EXCEPT
-
-        if args.clone:
-            if drepo_info is not None:
-                print("+++ The destination repository already exists. Please delete it or only use the `--githubData` option.")
-                return 3
-            vprint("--- Cloning source repo to destination")
-            vprint("----- Downloading info on source repo")
-            srepo_info = movers.repo.download_repository(srepo, args.sourceHost, all_credentials['src'])
-            if srepo_info['archived'] or srepo_info['disabled']:
-                print("+++ The source repository has been archived or disabled. Skipping...")
-                continue
-            try:
-                vprint("----- Creating new blank destination repo")
-                drepo_info = movers.repo.create_repository(srepo_info, drepo, args.destinationHost, all_credentials['dst'])
-                vprint("----- Cloning source repo commits/code/tags/etc. to destination")
-                movers.repo.clone_repository(srepo_info['clone_url'], drepo_info['clone_url'], all_credentials)
-            except (Exception) as e:
-                print("+++ Failed to clone source repository's codebase to destination repository.")
-                vprint("--- Exception | {}".format(e))
-                return 3
-            #END TRY/EXCEPT
-        #END IF
-
-        if 'githubData' in args:
-            if drepo_info is None:
-                print("+++ The destination repository does not exist. Please create it manually or use the `--clone` option.")
-                return 4
-            for gdt in movers.args.GITHUB_DATA_TYPES:
-                if args.githubData == '' or gdt in args.githubData:
-                    vprint("--- Copying source repository's {} data to destination".format(gdt))
-                    github_download_function = getattr(movers.repo, 'download_{}'.format(gdt))
-                    github_create_function = getattr(movers.repo, 'create_{}'.format(gdt))
-
-                    try:
-                        vprint("----- Downloading source repository's {} data".format(gdt))
-                        downloaded_data = github_download_function(srepo, args.sourceHost, all_credentials['src'])
-                        vprint("----- Uploading {} data to destination repository".format(gdt))
-                        creation_successful = github_create_function(downloaded_data, drepo, args.destinationHost, all_credentials['dst'])
-                        if not creation_successful:
-                            print("+++ Failed to successfully create {} data. Deleting partial repository from destination.".format(gdt))
-                            movers.repo._delete_repo(drepo, args.destinationHost, all_credentials['dst'])
-                            return 4
-                    except (Exception) as e:
-                        print("+++ Error while creating {} data. Deleting partial repository from destination.".format(gdt))
-                        vprint("----- Error encountered | {}".format(e))
-                        movers.repo._delete_repo(drepo, args.destinationHost, all_credentials['dst'])
-                        return 4
-                    #END TRY/EXCEPT
-                #END IF
-            #END FOR
-        #END IF
-        print("+++ Successfully created data in new destination repository")
-
-        # #####
-        # #
-        # # temp code while implementing
-        # do_delete = input(">>> delete? (Y/n): ")
-        # if do_delete == '' or do_delete.lower() == 'y':
-        #     movers.repo._delete_repo(drepo, args.destinationHost, all_credentials['dst'])
-        # #
-        # #####
-    #END FOR
-
-    print("Done!")
-    return 0
+    try:
+        return _run_actions(args, all_credentials)
+    finally:
+        if temp_lfs_cache is not None:
+            vprint("--- Removing temporary LFS cache '{}'".format(temp_lfs_cache))
+            shutil.rmtree(temp_lfs_cache, ignore_errors=True)
+    #END TRY/FINALLY
 #END MAIN
 
 if __name__ == "__main__":
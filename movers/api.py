@@ -50,9 +50,9 @@ def _response_is_valid(res:requests.Response, expected_code_min:int=200, expecte
 def do_send(
         method:str, host:str, uri:str,
         creds:tuple=None, data=None,
-        accept_header:str=None,
+        accept_header:str=None, extra_headers:dict=None,
         expected_code_min:int=200, expected_code_max:int=299,
-        do_wait:bool=False
+        do_wait:bool=False, verify:bool=None
 ) -> requests.Response:
     """Sends a GET request to the specified Github API URL.
 
@@ -63,9 +63,12 @@ def do_send(
         creds (tuple): The credentials for authentication in the following order; (username, pa-token). Default=None
         data (object): The data to pass to the `requests.request` function. Default=None
         accept_header (str): An override of the default value sent in the 'Accept' header.
+        extra_headers (dict): Any additional headers to send with the request (eg. 'If-None-Match'). Default=None
         expected_code_min (int): The minimum expected HTTP Response Code. Default=200
         expected_code_max (int): The maximum expected HTTP Response Code. Default=299
         do_wait (bool): Whether to wait a second before sending the request. Used to avoid rate limiting.
+        verify (bool): Whether to verify the server's SSL certificate.
+            Default=None (only verified for GITHUB_API_URL)
 
     Returns:
         str: The response from the Github server, as a string (should be JSON).
@@ -80,13 +83,15 @@ def do_send(
     this_headers = copy.deepcopy(BASE_HEADERS)
     if accept_header is not None:
         this_headers['Accept'] = accept_header
+    if extra_headers is not None:
+        this_headers.update(extra_headers)
 
     requestArgs = {
         'method': method,
         'url': (host+uri),
         'headers': this_headers,
         'auth': creds,
-        'verify': True if (host == gitmover_args.GITHUB_API_URL) else False,
+        'verify': (host.rstrip('/') == gitmover_args.GITHUB_API_URL) if verify is None else verify,
     }
     if data is not None:
         requestArgs['json'] = data
@@ -4,6 +4,7 @@
 # IMPORTS
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 import argparse
+import os
 import re
 
 
@@ -14,16 +15,33 @@ import re
 GHE_API_PATH = '/api/v3'
 GITHUB_URL = 'https://github.com'
 GITHUB_API_URL = 'https://api.github.com'
+GIT_REPO_REGEX = r"^([\w\-]+)\/([\w\-]+)$"
 GITHUB_DATA_TYPES = [
     'branches',
     'deploy_keys',
     'releases',
+    #Labels and Milestones need to be created before the Issues that use them
+    'labels',
+    'milestones',
+    'issues',
     ##To be implemented later, if necessary
     # 'collaborators',
-    # 'issues',
-    # 'milestones',
-    # 'labels',
 ]
+#Github data types handled by `movers.issues`. Their progress is kept in `--stateDir`, so a failed run can be resumed
+ISSUES_GITHUB_DATA_TYPES = [
+    'labels',
+    'milestones',
+    'issues',
+]
+#Github data types downloaded as a generator (instead of a list), so they are never held in memory all at once
+STREAMED_GITHUB_DATA_TYPES = [
+    'issues',
+]
+REPACK_THRESHOLD_MB = 500
+LFS_MAX_WORKERS = 32
+DAEMON_POLL_INTERVAL_MIN = 15
+DAEMON_POLL_INTERVAL_MAX = 3600
+DAEMON_MAX_WORKERS = 16
 
 
 
@@ -41,20 +59,39 @@ def get_arg_parser() -> argparse.ArgumentParser:
         argparse.ArugmentParser: The argument parser for this project.
     """
     parser = argparse.ArgumentParser(
-        usage='%(prog)s [OPTIONS] source_repo destination_repo',
+        usage='%(prog)s [OPTIONS] source_repo destination_repo\n       %(prog)s [OPTIONS] --manifest PATH',
         description='Migrate a repository between two Github server, complete with Milestones, Labels, and Issues.',
         formatter_class=argparse.RawTextHelpFormatter,
     )
     #Positional Args
     parser.add_argument(
         'source_repo',
+        nargs='?',
         type=str,
-        help="The owner and repo to migrate from: `<owner>/<repo_name>`. Multiple repos separated by a comma (,).",
+        help="The owner and repo to migrate from: `<owner>/<repo_name>`. Multiple repos separated by a comma (,).\n"+
+            "Not used with `--manifest`.",
     )
     parser.add_argument(
         'destination_repo',
+        nargs='?',
         type=str,
-        help="The owner and repo to migrate to: `<owner>/<repo_name>`. Multiple repos separated by a comma (,).",
+        help="The owner and repo to migrate to: `<owner>/<repo_name>`. Multiple repos separated by a comma (,).\n"+
+            "Not used with `--manifest`.",
+    )
+    #Batch Args
+    parser.add_argument(
+        '--manifest', dest='manifest',
+        type=str, action='store', default=None,
+        help="A CSV (with a header row) or JSON Lines file listing the repositories to migrate, one per row,\n"+
+            "instead of the positional arguments. Columns: source_repo, destination_repo (optional; default is\n"+
+            "source_repo), githubData and destinationHost (both optional; override the options of the same name).\n"+
+            "A failed row does not stop the rows after it.",
+    )
+    parser.add_argument(
+        '--results', dest='results',
+        type=str, action='store', default=None,
+        help="A JSON Lines file to append the outcome, timing and error of each repository to as it finishes.\n"+
+            "Re-running with the same file skips the repositories it records as successful. Not used with `--export`.",
     )
     #Credentials/Host Args
     parser.add_argument(
@@ -64,39 +101,39 @@ def get_arg_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         '-sh', '--sourceHost', dest='sourceHost',
-        nargs='?', required=True,
+        nargs='?',
         type=str, action='store',
         help="The GitHub host to migrate from.",
     )
     parser.add_argument(
         '-su', '--sourceUserName', dest='sourceUserName',
-        nargs='?', required=True,
+        nargs='?',
         type=str, action='store',
         help="Your Username for source GitHub.",
     )
     parser.add_argument(
         '-st', '--sourceToken', dest='sourceToken',
-        nargs='?', required=True,
+        nargs='?',
         type=str, action='store',
         help="Your Personal Access Token for the source GitHub account.",
     )
     parser.add_argument(
         '-dh', '--destinationHost', dest='destinationHost',
-        nargs='?',  required=True,
-        type=str, action='store',
-        help="The GitHub domain to migrate to.",
+        type=str, action='append',
+        help="The GitHub domain to migrate to.\n"+
+            "Repeat this option to migrate to several destinations at once (the source is only cloned once).",
     )
     parser.add_argument(
         '-du', '--destinationUserName', dest='destinationUserName',
-        nargs='?', required=True,
-        type=str, action='store',
-        help="Your Username for destination GitHub.",
+        type=str, action='append',
+        help="Your Username for destination GitHub.\n"+
+            "Repeat once per `--destinationHost`, or give once to use the same value for every destination.",
     )
     parser.add_argument(
         '-dt', '--destinationToken', dest='destinationToken',
-        nargs='?', required=True,
-        type=str, action='store',
-        help="Your Personal Access Token for the destination GitHub account.",
+        type=str, action='append',
+        help="Your Personal Access Token for the destination GitHub account.\n"+
+            "Repeat once per `--destinationHost`, or give once to use the same value for every destination.",
     )
     #Optional Args
     parser.add_argument(
@@ -113,6 +150,92 @@ def get_arg_parser() -> argparse.ArgumentParser:
         action="store_true", default=False,
         help="Clones source git repository's commits/branchs/tags to the destination.",
     )
+    parser.add_argument(
+        '--objectStore', dest='objectStore',
+        type=str, action='store', default=None,
+        help="Directory of a shared git object store to clone with (created if it does not exist).\n"+
+            "Objects shared by related repositories (eg. forks) are only downloaded and stored once.",
+    )
+    parser.add_argument(
+        '--repackThreshold', dest='repackThreshold',
+        type=int, action='store', default=REPACK_THRESHOLD_MB,
+        help="Source repositories of at least this many MB are repacked (with a reachability bitmap) after\n"+
+            "cloning, so the push to the destination starts sooner. Not done for clones that use `--objectStore`.\n"+
+            "Use -1 to never repack. Default={}".format(
+                REPACK_THRESHOLD_MB,
+            ),
+    )
+    parser.add_argument(
+        '--repackThreads', dest='repackThreads',
+        type=int, action='store', default=None,
+        help="The most threads the repack may use. Default=the number of CPUs, up to 4",
+    )
+    parser.add_argument(
+        '--stateDir', dest='stateDir',
+        type=str, action='store', default=None,
+        help="Directory to keep the source-to-destination Milestone and Issue number mappings in.\n"+
+            "Re-running `--githubData` with the same directory skips Milestones and Issues already created.\n"+
+            "Default=a new temporary directory, kept after the run",
+    )
+    #Git LFS Args
+    parser.add_argument(
+        '--lfs',
+        action="store_true", default=False,
+        help="With `--clone`, also copies the Git LFS objects referenced by any branch or tag to the destination.\n"+
+            "Objects the destination already has are skipped.",
+    )
+    parser.add_argument(
+        '--lfsCache', dest='lfsCache',
+        type=str, action='store', default=None,
+        help="Directory to keep downloaded LFS objects in. Objects shared by several repositories are only\n"+
+            "downloaded once. Default=a new temporary directory (removed when the script exits)",
+    )
+    parser.add_argument(
+        '--lfsWorkers', dest='lfsWorkers',
+        type=int, action='store', default=8,
+        help="How many LFS objects may be transferred at the same time (1-{}). Default=8".format(LFS_MAX_WORKERS),
+    )
+    #Offline Transfer Args
+    parser.add_argument(
+        '--export', dest='exportDir',
+        type=str, action='store', default=None,
+        help="Instead of migrating, writes each source repository as a `git bundle` (plus a JSON dump of its\n"+
+            "`--githubData`) to this directory, with checksums. Re-running skips repositories already exported.\n"+
+            "The destination options are not needed.",
+    )
+    parser.add_argument(
+        '--import', dest='importDir',
+        type=str, action='store', default=None,
+        help="Migrates from a directory written by `--export` instead of from the source host. Use with\n"+
+            "`--clone` and/or `--githubData`. Re-running skips repositories whose requested data was already imported. The source options are not needed.",
+    )
+    #Mirror Daemon Args
+    parser.add_argument(
+        '-D', '--daemon',
+        action="store_true", default=False,
+        help="Runs continuously, mirroring new branches/tags/releases from the source repositories to their\n"+
+            "already existing destination repositories until stopped with Ctrl+C.",
+    )
+    parser.add_argument(
+        '--pollInterval', dest='pollInterval',
+        type=int, action='store', default=60,
+        help="Seconds between polls of each source repository in `--daemon` mode ({}-{}). Default=60".format(
+            DAEMON_POLL_INTERVAL_MIN, DAEMON_POLL_INTERVAL_MAX,
+        ),
+    )
+    parser.add_argument(
+        '--maxWorkers', dest='maxWorkers',
+        type=int, action='store', default=4,
+        help="How many repositories may be synced at the same time in `--daemon` mode (1-{}). Default=4".format(
+            DAEMON_MAX_WORKERS,
+        ),
+    )
+    parser.add_argument(
+        '--mirrorDir', dest='mirrorDir',
+        type=str, action='store', default=None,
+        help="Directory to keep the local mirrors in for `--daemon` mode. Reusing the same directory between\n"+
+            "runs avoids downloading each repository's history again. Default=a new temporary directory",
+    )
 
     return parser
 #END DEF
@@ -127,7 +250,10 @@ def validate_repo_args(args:argparse.Namespace) -> None:
         None
 
     Raises:
-        RuntimeError: The parsed repo arguments have an invalid string.
+        RuntimeError: The parsed repo arguments have an invalid string, or are missing without `--manifest`.
+
+    With `--manifest`, the repositories are read (and validated) one row at a time while they are processed
+    (see `movers.manifest`), so the positional arguments must not be given.
 
     The input param `args` is modified in place in the following manner:
         - `args.source_repo` copied to `args.source_repo_original`
@@ -137,7 +263,15 @@ def validate_repo_args(args:argparse.Namespace) -> None:
         - `args.destination_repo` split into list on comma (`,`)
         - All items in `args.destination_repo` checked with regular expression to be a valid repository name
     """
-    git_repo_regex = r"^([\w\-]+)\/([\w\-]+)$"
+    if args.manifest is not None:
+        if args.source_repo is not None or args.destination_repo is not None:
+            raise RuntimeError("The source and destination repositories cannot be given with `--manifest`.")
+        if not os.path.isfile(args.manifest):
+            raise RuntimeError("Manifest '{}' does not exist.".format(args.manifest))
+        return
+    if args.source_repo is None or args.destination_repo is None:
+        raise RuntimeError("The source and destination repositories are required, unless using `--manifest`.")
+
     args.source_repo_original = args.source_repo
     args.destination_repo_original = args.destination_repo
 
@@ -148,7 +282,7 @@ def validate_repo_args(args:argparse.Namespace) -> None:
         args.source_repo = [args.source_repo.strip()]
     #Validating that all of the repos specified as sources are in a valid format
     for srepo in args.source_repo:
-        srematch = re.match(git_repo_regex, srepo)
+        srematch = re.match(GIT_REPO_REGEX, srepo)
         if srematch is None:
             raise RuntimeError("Source Repository '{}' is not a valid repository name.".format(srepo))
     #END FOR
@@ -172,7 +306,7 @@ def validate_repo_args(args:argparse.Namespace) -> None:
         if drepo == '.':
             args.destination_repo[i] = args.source_repo[i]
         else:
-            drematch = re.match(git_repo_regex, drepo)
+            drematch = re.match(GIT_REPO_REGEX, drepo)
             if drematch is None:
                 raise RuntimeError("Destination Repository '{}' is not a valid repository name.".format(drepo))
     #END FOR
@@ -180,8 +314,29 @@ def validate_repo_args(args:argparse.Namespace) -> None:
     return
 #END DEF
 
+def _clean_host(host:str) -> str:
+    """Converts a Github Host given on the command line into the base URL of that host's API.
+
+    Arguments:
+        host (str): The HTTPS URL of a Github server.
+
+    Returns:
+        str: If GITHUB_URL or GITHUB_API_URL, GITHUB_API_URL. Else, the given value with GHE_API_PATH added to the end.
+            The returned value always ends with a slash (`/`).
+    """
+    if host.endswith('/'):
+        host = host[:-1]
+    if host in [GITHUB_URL, GITHUB_API_URL]:
+        host = GITHUB_API_URL
+    else:
+        if host[(-1*len(GHE_API_PATH)):] != GHE_API_PATH:
+            host += GHE_API_PATH
+    #END IF/ELSE
+    return host + '/'
+#END DEF
+
 def validate_hosts(args:argparse.Namespace) -> None:
-    """Parses the expected "repository" arguments and validates them.
+    """Parses the expected "host" arguments and validates them.
 
     Arguments:
         args (argparse.Namespace): The result of `parser.parse_args` from the main script.
@@ -192,40 +347,111 @@ def validate_hosts(args:argparse.Namespace) -> None:
     Raises:
         RuntimeError: The parsed host arguments are invalid.
 
+    The source arguments are not required when using `--import`, and the destination arguments are not required
+    when using `--export`.
+
     The input param `args` is modified in place in the following manner:
         - `args.sourceHost` copied to `args.sourceHost_original`
-        - If currently GITHUB_URL or GITHUB_API_URL, `args.sourceHost` converted to GITHUB_API_URL.
-          Else, GHE_API_PATH added to end of given value.
-        - `args.destinationHost` copied to `args.destinationHost_original`
-        - If currently GITHUB_URL or GITHUB_API_URL, `args.destinationHost` converted to GITHUB_API_URL.
-          Else, GHE_API_PATH added to end of given value.
+        - `args.sourceHost` (if given) cleaned with `_clean_host`.
+        - `args.destinationHost` (a list) copied to `args.destinationHost_original`
+        - Every item of `args.destinationHost` cleaned with `_clean_host`.
+        - If only one `args.destinationUserName` or `args.destinationToken` was given, it is repeated
+          so there is one for every item of `args.destinationHost`.
     """
-    if any([ ('https://' != v[:8]) for v in [args.sourceHost, args.destinationHost]]):
+    if args.importDir is None and any([v is None for v in [args.sourceHost, args.sourceUserName, args.sourceToken]]):
+        raise RuntimeError("The source host, username and token are required, unless using `--import`.")
+    if args.exportDir is None and any([not v for v in [args.destinationHost, args.destinationUserName, args.destinationToken]]):
+        raise RuntimeError("The destination host, username and token are required, unless using `--export`.")
+    args.destinationHost = args.destinationHost or []
+    args.destinationUserName = args.destinationUserName or []
+    args.destinationToken = args.destinationToken or []
+
+    if any([ ('https://' != v[:8]) for v in [args.sourceHost] + args.destinationHost if v is not None]):
         raise RuntimeError("This script only supports Source and Destination Github Hosts specified using an HTTPS URL.")
 
+    for dest_arg in ['destinationUserName', 'destinationToken']:
+        dest_values = getattr(args, dest_arg)
+        if len(dest_values) == 1 and args.destinationHost:
+            setattr(args, dest_arg, dest_values * len(args.destinationHost))
+        elif len(dest_values) != len(args.destinationHost):
+            raise RuntimeError(
+                "Number of `--{}` values ({}) does not equal the number of destination hosts ({}).".format(
+                    dest_arg, len(dest_values), len(args.destinationHost),
+                )
+            )
+    #END FOR
+
     args.sourceHost_original = args.sourceHost
-    args.destinationHost_original = args.destinationHost
-    if args.sourceHost.endswith('/'):
-        args.sourceHost = args.sourceHost[:-1]
-    if args.destinationHost.endswith('/'):
-        args.destinationHost = args.destinationHost[:-1]
-
-    if args.sourceHost in [GITHUB_URL, GITHUB_API_URL]:
-        args.sourceHost = GITHUB_API_URL
-    else:
-        if args.sourceHost[(-1*len(GHE_API_PATH)):] != GHE_API_PATH:
-            args.sourceHost += GHE_API_PATH
-    #END IF/ELSE
+    args.destinationHost_original = list(args.destinationHost)
+    if args.sourceHost is not None:
+        args.sourceHost = _clean_host(args.sourceHost)
+    args.destinationHost = [_clean_host(v) for v in args.destinationHost]
+
+    return
+#END DEF
+
+def validate_repack_args(args:argparse.Namespace) -> None:
+    """Parses the repack arguments and validates them.
 
-    if args.destinationHost in [GITHUB_URL, GITHUB_API_URL]:
-        args.destinationHost = GITHUB_API_URL
+    Arguments:
+        args (argparse.Namespace): The result of `parser.parse_args` from the main script.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: The number of repack threads is not positive.
+
+    The input param `args` is modified in place in the following manner:
+        - `args.repackThreshold` converted from MB to KB (the unit of a repository's 'size' in the Github API),
+          or set to None if negative (never repack).
+    """
+    if args.repackThreads is not None and args.repackThreads < 1:
+        raise RuntimeError("Repack threads must be at least 1.")
+    if args.repackThreshold < 0:
+        args.repackThreshold = None
     else:
-        if args.destinationHost[(-1*len(GHE_API_PATH)):] != GHE_API_PATH:
-            args.destinationHost += GHE_API_PATH
-    #END IF/ELSE
+        args.repackThreshold *= 1024
 
-    args.sourceHost += '/'
-    args.destinationHost += '/'
+    return
+#END DEF
+
+def validate_lfs_args(args:argparse.Namespace) -> None:
+    """Validates the Git LFS arguments.
+
+    Arguments:
+        args (argparse.Namespace): The result of `parser.parse_args` from the main script.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: The number of LFS workers is out of bounds.
+    """
+    if not (1 <= args.lfsWorkers <= LFS_MAX_WORKERS):
+        raise RuntimeError("LFS workers must be between 1 and {}.".format(LFS_MAX_WORKERS))
+
+    return
+#END DEF
+
+def validate_daemon_args(args:argparse.Namespace) -> None:
+    """Validates the arguments used by the `--daemon` mode.
+
+    Arguments:
+        args (argparse.Namespace): The result of `parser.parse_args` from the main script.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: The polling interval or number of workers is out of bounds.
+    """
+    if not (DAEMON_POLL_INTERVAL_MIN <= args.pollInterval <= DAEMON_POLL_INTERVAL_MAX):
+        raise RuntimeError(
+            "Poll interval must be between {} and {} seconds.".format(DAEMON_POLL_INTERVAL_MIN, DAEMON_POLL_INTERVAL_MAX)
+        )
+    if not (1 <= args.maxWorkers <= DAEMON_MAX_WORKERS):
+        raise RuntimeError("Max workers must be between 1 and {}.".format(DAEMON_MAX_WORKERS))
 
     return
 #END DEF
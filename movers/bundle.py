@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# IMPORTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from . import args as gitmover_args
+from . import issues as gitmover_issues
+from . import records as gitmover_records
+from . import repo as gitmover_repo
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# CONSTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+EXPORT_MANIFEST_FILE = 'manifest.json'
+IMPORT_STATE_FILE = 'import_state.json'
+EXPORT_FORMAT_VERSION = 1
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# FUNCTIONS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# Replaced by `git_mover._define_verbose_print` once the script's arguments have been parsed.
+vprint = lambda *a: None
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   FILE HELPER FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def _sha256_file(path:str) -> str:
+    """Computes the SHA-256 checksum of a file, reading it sequentially in fixed-size chunks.
+
+    Arguments:
+        path (str): The file to checksum.
+
+    Returns:
+        str: The hex digest of the file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as in_file:
+        for chunk in iter(lambda: in_file.read(CHECKSUM_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+#END DEF
+
+def _read_json_file(path:str, default=None):
+    """Reads a JSON file, returning the default value if it does not exist.
+
+    Arguments:
+        path (str): The JSON file to read.
+        default (object): The value to return when the file does not exist. Default=None
+
+    Returns:
+        object: The parsed contents of the file.
+    """
+    if not os.path.isfile(path):
+        return default
+    with open(path, 'r') as in_file:
+        return json.load(in_file)
+#END DEF
+
+def _write_json_file(path:str, data) -> None:
+    """Writes a JSON file atomically, so an interrupted write never leaves a truncated file behind.
+
+    Arguments:
+        path (str): The JSON file to write.
+        data (object): The data to write. May contain records (see `movers.records`).
+
+    Returns:
+        None
+    """
+    partial_path = path + '.partial'
+    with open(partial_path, 'w') as out_file:
+        json.dump(data, out_file, indent=2, default=gitmover_records.to_json)
+    os.replace(partial_path, path)
+#END DEF
+
+def _file_prefix(repo:str) -> str:
+    """Gets the prefix used for the names of a repository's files in an export directory.
+
+    Arguments:
+        repo (str): The repository, as `<owner>/<repo_name>`.
+
+    Returns:
+        str: The repository name, safe to use as a file name (eg. `owner__repo_name`).
+    """
+    return repo.replace('/', '__')
+#END DEF
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   EXPORT FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def _export_is_complete(entry:dict, export_dir:str) -> bool:
+    """Checks whether a repository's files in the export directory match its manifest entry.
+
+    Arguments:
+        entry (dict): The repository's entry in the export manifest. May be None.
+        export_dir (str): The export directory.
+
+    Returns:
+        bool: True if every file listed in the entry exists and has the recorded checksum.
+    """
+    if entry is None:
+        return False
+    for file_key in ['bundle', 'data']:
+        if entry[file_key] is None:
+            continue
+        file_path = os.path.join(export_dir, entry[file_key])
+        if not os.path.isfile(file_path) or _sha256_file(file_path) != entry[file_key + '_sha256']:
+            return False
+    #END FOR
+    for stream in entry.get('streams', {}).values():
+        file_path = os.path.join(export_dir, stream['file'])
+        if not os.path.isfile(file_path) or _sha256_file(file_path) != stream['sha256']:
+            return False
+    #END FOR
+    return True
+#END DEF
+
+def export_repository(
+        repo:str, host:str, creds:tuple, export_dir:str,
+        data_types:list, object_store:str=None, repack_threshold:int=None, repack_threads:int=None
+) -> bool:
+    """Exports a repository as a `git bundle` and a JSON dump of its Github data.
+
+    Arguments:
+        repo (str): The source repository.
+        host (str): The source Github Host.
+        creds (tuple): The credentials for the source Github Host.
+        export_dir (str): The directory to write the export to. Created if it does not exist.
+        data_types (list): The types of Github data to dump (see `movers.args.GITHUB_DATA_TYPES`).
+        object_store (str): The directory of a shared object store to clone with. Default=None
+        repack_threshold (int): Repack the clone before bundling it if the repository is at least this size,
+            in KiB (as reported in the 'size' of the repository's info). Default=None (never repack)
+        repack_threads (int): The most threads `git repack` may use. Default=None
+
+    Returns:
+        bool: True if the repository was exported. False if a complete export of it already existed.
+
+    Raises:
+        RuntimeError: The repository could not be cloned or bundled.
+
+    The export directory holds a `manifest.json` with the SHA-256 checksum of every file. A repository whose
+    files already match the manifest is skipped, so an interrupted export can simply be run again.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    manifest_path = os.path.join(export_dir, EXPORT_MANIFEST_FILE)
+    manifest = _read_json_file(manifest_path, {'version': EXPORT_FORMAT_VERSION, 'repositories': {}})
+    if _export_is_complete(manifest['repositories'].get(repo), export_dir):
+        return False
+
+    file_prefix = _file_prefix(repo)
+    entry = {'bundle': None, 'bundle_sha256': None, 'data': file_prefix + '.json', 'data_sha256': None, 'streams': {}}
+
+    vprint("----- Downloading info and Github data of source repo")
+    github_data = {'repository': gitmover_repo.download_repository(repo, host, creds)}
+    for gdt in data_types:
+        github_download_function = gitmover_repo.get_github_data_function('download', gdt)
+        if gdt in gitmover_args.STREAMED_GITHUB_DATA_TYPES:
+            #Streamed data is written to its own JSON Lines file as it is downloaded
+            stream_file = '{}.{}.jsonl'.format(file_prefix, gdt)
+            stream_path = os.path.join(export_dir, stream_file)
+            gitmover_issues.spool_items(github_download_function(repo, host, creds), stream_path + '.partial')
+            os.replace(stream_path + '.partial', stream_path)
+            entry['streams'][gdt] = {'file': stream_file, 'sha256': _sha256_file(stream_path)}
+        else:
+            github_data[gdt] = github_download_function(repo, host, creds)
+    #END FOR
+    data_path = os.path.join(export_dir, entry['data'])
+    _write_json_file(data_path, github_data)
+    entry['data_sha256'] = _sha256_file(data_path)
+
+    vprint("----- Cloning source repo and writing bundle")
+    temp_dir = gitmover_repo._clone_source(github_data['repository'].clone_url, creds, object_store=object_store)
+    try:
+        if repack_threshold is not None and github_data['repository'].size >= repack_threshold:
+            gitmover_repo._repack_and_report(temp_dir, threads=repack_threads)
+        #`git bundle` refuses to create an empty bundle, so a repository without any refs has none
+        if gitmover_repo._list_refs(temp_dir, ['refs/']):
+            entry['bundle'] = file_prefix + '.bundle'
+            bundle_path = os.path.join(export_dir, entry['bundle'])
+            res = gitmover_repo._git(['bundle', 'create', '--quiet', bundle_path + '.partial', '--all'], git_dir=temp_dir)
+            if res.returncode != 0:
+                raise RuntimeError("Failed to create bundle of '{}'. {}".format(repo, res.stderr))
+            os.replace(bundle_path + '.partial', bundle_path)
+            entry['bundle_sha256'] = _sha256_file(bundle_path)
+        #END IF
+    finally:
+        shutil.rmtree(temp_dir)
+    #END TRY/FINALLY
+
+    manifest['repositories'][repo] = entry
+    _write_json_file(manifest_path, manifest)
+    return True
+#END DEF
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   IMPORT FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def load_export(repo:str, export_dir:str) -> tuple:
+    """Loads a repository's exported Github data, after verifying the checksums of all of its files.
+
+    Arguments:
+        repo (str): The source repository, as it was given to `export_repository`.
+        export_dir (str): The export directory.
+
+    Returns:
+        tuple: (github_data, bundle_path)
+            github_data (dict): The dumped Github data. The source repository's Repository record is under 'repository',
+                and each exported type of Github data under its own name (eg. 'releases'). Streamed types
+                (eg. 'issues') are generators that read their file as they are consumed.
+            bundle_path (str): The path to the repository's bundle, or None if the repository was empty.
+
+    Raises:
+        RuntimeError: The repository is not in the export, or one of its files is missing or corrupt.
+    """
+    manifest = _read_json_file(os.path.join(export_dir, EXPORT_MANIFEST_FILE), {'repositories': {}})
+    entry = manifest['repositories'].get(repo)
+    if entry is None:
+        raise RuntimeError("Repository '{}' is not in the export '{}'.".format(repo, export_dir))
+    if not _export_is_complete(entry, export_dir):
+        raise RuntimeError("The exported files of '{}' are missing or do not match their checksums.".format(repo))
+    github_data = _read_json_file(os.path.join(export_dir, entry['data']))
+    github_data['repository'] = gitmover_records.Repository.from_dict(github_data['repository'])
+    for gdt, record_type in gitmover_records.GITHUB_DATA_RECORDS.items():
+        if gdt in github_data:
+            github_data[gdt] = [record_type.from_dict(item) for item in github_data[gdt]]
+    #END FOR
+    for gdt, stream in entry.get('streams', {}).items():
+        github_data[gdt] = gitmover_issues.read_spooled_items(os.path.join(export_dir, stream['file']))
+    bundle_path = None if entry['bundle'] is None else os.path.join(export_dir, entry['bundle'])
+    return github_data, bundle_path
+#END DEF
+
+def push_bundle(bundle_path:str, destination_clone_urls:list, destination_creds:list) -> bool:
+    """Pushes everything in a bundle to every one of the destination repositories.
+
+    Arguments:
+        bundle_path (str): The bundle to push. If None (an empty repository), nothing is pushed.
+        destination_clone_urls (list): The full URLs to push the bundle to.
+        destination_creds (list): One set of credentials for each of `destination_clone_urls`.
+
+    Returns:
+        bool: True if the push to every destination succeeded. False if not.
+
+    Raises:
+        RuntimeError: The bundle could not be unpacked.
+    """
+    if bundle_path is None:
+        return True
+    temp_dir = tempfile.mkdtemp()
+    try:
+        res = gitmover_repo._git(['clone', '--bare', '--quiet', os.path.abspath(bundle_path), temp_dir])
+        if res.returncode != 0:
+            raise RuntimeError("Failed to unpack bundle '{}'. {}".format(bundle_path, res.stderr))
+        return gitmover_repo._push_to_destinations(temp_dir, destination_clone_urls, destination_creds)
+    finally:
+        shutil.rmtree(temp_dir)
+    #END TRY/FINALLY
+#END DEF
+
+def is_imported(export_dir:str, repo:str, hosts:list, actions:list) -> bool:
+    """Checks whether the given actions have already been imported for a repository to every one of the given hosts.
+
+    Arguments:
+        export_dir (str): The export directory.
+        repo (str): The destination repository.
+        hosts (list): The destination Github Hosts.
+        actions (list): The requested actions ('clone' and/or types of Github data).
+
+    Returns:
+        bool: True if `mark_imported` recorded every one of `actions` for the repository on every host.
+    """
+    import_state = _read_json_file(os.path.join(export_dir, IMPORT_STATE_FILE), {})
+    return all([set(actions) <= set(import_state.get(host, {}).get(repo, [])) for host in hosts])
+#END DEF
+
+def mark_imported(export_dir:str, repo:str, hosts:list, actions:list) -> None:
+    """Records the actions that have been imported for a repository to the given hosts, so a re-run of the same import skips it.
+
+    Arguments:
+        export_dir (str): The export directory.
+        repo (str): The destination repository.
+        hosts (list): The destination Github Hosts.
+        actions (list): The actions that were completed ('clone' and/or types of Github data).
+
+    Returns:
+        None
+    """
+    import_state_path = os.path.join(export_dir, IMPORT_STATE_FILE)
+    import_state = _read_json_file(import_state_path, {})
+    for host in hosts:
+        done = import_state.setdefault(host, {}).setdefault(repo, [])
+        done += [action for action in actions if action not in done]
+    #END FOR
+    _write_json_file(import_state_path, import_state)
+#END DEF
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# IMPORTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlparse
+from . import api as gitmover_api
+from .exceptions import GitMoverApiCallError
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# CONSTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+ITEMS_PER_PAGE = 100
+COMMENT_WRITE_WORKERS = 4
+MILESTONE_MAP_FILE = 'milestones.map'
+ISSUE_MAP_FILE = 'issues.map'
+COMMENTS_DONE_FILE = 'comments.done'
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# FUNCTIONS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# Replaced by `git_mover._define_verbose_print` once the script's arguments have been parsed.
+vprint = lambda *a: None
+
+# Used by `_get_state_dir` when no state directory is given. `git_mover` always gives one.
+_default_state_dir = None
+_default_state_dir_lock = threading.Lock()
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   HELPER FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def _paginate(uri:str, host:str, creds:tuple, query:str=''):
+    """Fetches every item of a paginated Github API list, one page at a time.
+
+    Arguments:
+        uri (str): The URI of the list (without a query string).
+        host (str): The Github Host that we will be connecting to.
+        creds (tuple): The credentials for authentication.
+        query (str): Extra query string parameters (eg. 'state=all&'). Default=''
+
+    Yields:
+        dict: Each item of the list, in the order the API returns them.
+    """
+    page = 1
+    while True:
+        res = gitmover_api.do_send(
+            'GET', host, "{}?{}per_page={}&page={}".format(uri, query, ITEMS_PER_PAGE, page), creds,
+        )
+        items = json.loads(res.content)
+        for item in items:
+            yield item
+        if len(items) < ITEMS_PER_PAGE:
+            return
+        page += 1
+    #END WHILE
+#END DEF
+
+def _get_state_dir(state_dir:str, repo:str, host:str) -> str:
+    """Gets (and creates) the directory holding the ID mappings for one destination repository.
+
+    Arguments:
+        state_dir (str): The base state directory. If None, a temporary directory (the same one for the whole run) is used.
+        repo (str): The destination Repo.
+        host (str): The destination Github Host.
+
+    Returns:
+        str: The directory for this repository on this host.
+    """
+    global _default_state_dir
+    if state_dir is None:
+        with _default_state_dir_lock:
+            if _default_state_dir is None:
+                _default_state_dir = tempfile.mkdtemp(prefix='git_mover_state_')
+        #END WITH
+        state_dir = _default_state_dir
+    repo_state_dir = os.path.join(state_dir, urlparse(host).netloc, repo.replace('/', '__'))
+    os.makedirs(repo_state_dir, exist_ok=True)
+    return repo_state_dir
+#END DEF
+
+def clear_state(state_dir:str, repo:str, host:str) -> None:
+    """Removes the ID mappings kept for one destination repository (eg. because the repository was deleted).
+
+    Arguments:
+        state_dir (str): The base state directory. If None, the temporary one used for the whole run.
+        repo (str): The destination Repo.
+        host (str): The destination Github Host.
+
+    Returns:
+        None
+    """
+    shutil.rmtree(_get_state_dir(state_dir, repo, host), ignore_errors=True)
+#END DEF
+
+def _read_id_map(path:str) -> dict:
+    """Reads a source-to-destination ID mapping file, written as one "<source> <destination>" pair per line.
+
+    Arguments:
+        path (str): The mapping file.
+
+    Returns:
+        dict: A mapping of source ID to destination ID (both int). Empty if the file does not exist.
+    """
+    id_map = {}
+    if os.path.isfile(path):
+        with open(path, 'r') as in_file:
+            for line in in_file:
+                source_id, destination_id = line.split()
+                id_map[int(source_id)] = int(destination_id)
+        #END WITH
+    return id_map
+#END DEF
+
+def _append_line(path:str, line:str, lock:threading.Lock=None) -> None:
+    """Appends one line to a state file, flushing it to disk straight away.
+
+    Arguments:
+        path (str): The state file.
+        line (str): The line to append (without a newline).
+        lock (threading.Lock): A lock to hold while writing, if the file is shared between threads. Default=None
+
+    Returns:
+        None
+    """
+    if lock is not None:
+        with lock:
+            return _append_line(path, line)
+    with open(path, 'a') as out_file:
+        out_file.write(line + '\n')
+        out_file.flush()
+        os.fsync(out_file.fileno())
+#END DEF
+
+def _attribution(login:str, created_at:str) -> str:
+    """Gets the line added to migrated issues and comments, since they are created by the migrating user.
+
+    Arguments:
+        login (str): The login of the original author.
+        created_at (str): When the original was created.
+
+    Returns:
+        str: The attribution line. The login is not @-mentioned, so nobody is notified.
+    """
+    return "_Originally posted by **{}** on {}_\n\n".format(login, created_at)
+#END DEF
+
+def spool_items(items, path:str) -> None:
+    """Writes a stream of Github data items to a JSON Lines file, one item at a time.
+
+    Arguments:
+        items (iterable): The items to write (eg. the result of `download_issues`).
+        path (str): The file to write.
+
+    Returns:
+        None
+    """
+    with open(path, 'w') as out_file:
+        for item in items:
+            out_file.write(json.dumps(item) + '\n')
+    #END WITH
+#END DEF
+
+def read_spooled_items(path:str):
+    """Reads back the items written by `spool_items`, one at a time.
+
+    Arguments:
+        path (str): The JSON Lines file.
+
+    Yields:
+        dict: Each item, in the order it was written.
+    """
+    with open(path, 'r') as in_file:
+        for line in in_file:
+            yield json.loads(line)
+    #END WITH
+#END DEF
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   DOWNLOAD FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def download_labels(repo:str, host:str, creds:tuple) -> list:
+    """Gets the Labels for the given repository.
+
+    Arguments:
+        repo (str): The Repo we are getting information about.
+        host (str): The Github Host that we will be connecting to.
+        creds (tuple): The credentials for authentication.
+
+    Returns:
+        list: The Labels, as dictionaries of the fields needed to create them.
+    """
+    return [
+        {'name': lb['name'], 'color': lb['color'], 'description': lb.get('description')}
+        for lb in _paginate("repos/{}/labels".format(repo), host, creds)
+    ]
+#END DEF
+
+def download_milestones(repo:str, host:str, creds:tuple) -> list:
+    """Gets the open and closed Milestones for the given repository, in number order.
+
+    Arguments:
+        repo (str): The Repo we are getting information about.
+        host (str): The Github Host that we will be connecting to.
+        creds (tuple): The credentials for authentication.
+
+    Returns:
+        list: The Milestones, as dictionaries of the fields needed to create them (plus the source 'number').
+    """
+    milestones = [
+        {
+            'number': ms['number'],
+            'title': ms['title'],
+            'state': ms['state'],
+            'description': ms.get('description'),
+            'due_on': ms.get('due_on'),
+        }
+        for ms in _paginate("repos/{}/milestones".format(repo), host, creds, query='state=all&')
+    ]
+    return sorted(milestones, key=lambda ms: ms['number'])
+#END DEF
+
+def download_issues(repo:str, host:str, creds:tuple):
+    """Streams the open and closed Issues (not Pull Requests) of the given repository, with their comments.
+
+    Arguments:
+        repo (str): The Repo we are getting information about.
+        host (str): The Github Host that we will be connecting to.
+        creds (tuple): The credentials for authentication.
+
+    Yields:
+        dict: Each Issue in number order, with only the fields needed to create it. Its 'comments' are
+            a list of dictionaries with the 'user', 'created_at' and 'body' of each comment.
+
+    Issues are fetched one page at a time as they are consumed, and the comments of an issue are only fetched
+    when that issue is reached, so memory use does not grow with the number of issues.
+    """
+    for issue in _paginate("repos/{}/issues".format(repo), host, creds, query='state=all&sort=created&direction=asc&'):
+        if 'pull_request' in issue:
+            continue
+        comments = []
+        if issue['comments'] > 0:
+            comments = [
+                {'user': cm['user']['login'], 'created_at': cm['created_at'], 'body': cm['body']}
+                for cm in _paginate("repos/{}/issues/{}/comments".format(repo, issue['number']), host, creds)
+            ]
+        yield {
+            'number': issue['number'],
+            'title': issue['title'],
+            'body': issue['body'],
+            'state': issue['state'],
+            'user': issue['user']['login'],
+            'created_at': issue['created_at'],
+            'labels': [lb['name'] for lb in issue['labels']],
+            'milestone': issue['milestone']['number'] if issue['milestone'] else None,
+            'comments': comments,
+        }
+    #END FOR
+#END DEF
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   CREATE FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def create_labels(labels:list, repo:str, host:str, creds:tuple, **kwargs) -> bool:
+    """Creates Labels for the specified repository, updating any that already exist (eg. Github's default labels).
+
+    Arguments:
+        labels (list): A list of Labels to create on the specified repository.
+        repo (str): The destination Repo.
+        host (str): The destination Github Host.
+        creds (tuple): The credentials for authentication.
+
+    Returns:
+        bool: The Labels were successfully created
+
+    Raises:
+        RuntimeError: The call to create the specified data on the Github repository failed in an unexpected way
+    """
+    for lb in labels:
+        uri = "repos/{}/labels".format(repo)
+        data = {k: v for k, v in lb.items() if v is not None}
+        try:
+            gitmover_api.do_send('POST', host, uri, creds, do_wait=True, data=data)
+        except (GitMoverApiCallError) as e:
+            api_res = e.get_api_response()
+            if api_res.status_code != 422:
+                raise RuntimeError("Unknown error while creating Label.") from e
+            try:
+                gitmover_api.do_send('PATCH', host, "{}/{}".format(uri, quote(lb['name'], safe='')), creds, do_wait=True, data=data)
+            except (GitMoverApiCallError) as e:
+                vprint(
+                    "--- API Response from `PATCH` to `{}` gave HTTP response code {}. ".format(uri, e.get_api_response().status_code) +
+                    "The label '{}' was invalid.".format(lb['name'])
+                )
+                return False
+            #END TRY/EXCEPT
+        #END TRY/EXCEPT
+    #END FOR
+    return True
+#END DEF
+
+def create_milestones(milestones:list, repo:str, host:str, creds:tuple, state_dir:str=None, **kwargs) -> bool:
+    """Creates Milestones for the specified repository, recording the number each one was given.
+
+    Arguments:
+        milestones (list): A list of Milestones to create on the specified repository.
+        repo (str): The destination Repo.
+        host (str): The destination Github Host.
+        creds (tuple): The credentials for authentication.
+        state_dir (str): The directory to keep source-to-destination ID mappings in. Default=None (temporary)
+
+    Returns:
+        bool: The Milestones were successfully created
+
+    Raises:
+        RuntimeError: The call to create the specified data on the Github repository failed in an unexpected way
+
+    Milestones that were already created by an earlier run with the same `state_dir` are skipped.
+    """
+    milestone_map_path = os.path.join(_get_state_dir(state_dir, repo, host), MILESTONE_MAP_FILE)
+    milestone_map = _read_id_map(milestone_map_path)
+    for ms in milestones:
+        if ms['number'] in milestone_map:
+            continue
+        uri = "repos/{}/milestones".format(repo)
+        data = {'title': ms['title'], 'state': ms['state'], 'description': ms['description']}
+        if ms['due_on'] is not None:
+            data['due_on'] = ms['due_on']
+        try:
+            res = gitmover_api.do_send('POST', host, uri, creds, do_wait=True, data=data)
+        except (GitMoverApiCallError) as e:
+            api_res = e.get_api_response()
+            if api_res.status_code == 422:
+                vprint(
+                    "--- API Response from `POST` to `{}` gave HTTP response code 422. ".format(uri) +
+                    "The milestone '{}' was invalid.".format(ms['title'])
+                )
+                return False
+            else:
+                raise RuntimeError("Unknown error while creating Milestone.") from e
+        #END TRY/EXCEPT
+        _append_line(milestone_map_path, "{} {}".format(ms['number'], json.loads(res.content)['number']))
+    #END FOR
+    return True
+#END DEF
+
+def _create_comments(comments:list, skip:int, issue_number:int, repo:str, host:str, creds:tuple) -> None:
+    """Creates the comments of one issue, in order. Run on the comment writer threads.
+
+    Arguments:
+        comments (list): The comments, as given by `download_issues`.
+        skip (int): How many of the comments already exist on the destination issue.
+        issue_number (int): The number of the destination issue.
+        repo (str): The destination Repo.
+        host (str): The destination Github Host.
+        creds (tuple): The credentials for authentication.
+
+    Returns:
+        None
+
+    Raises:
+        GitMoverApiCallError: A comment could not be created.
+    """
+    for cm in comments[skip:]:
+        gitmover_api.do_send(
+            'POST', host, "repos/{}/issues/{}/comments".format(repo, issue_number), creds, do_wait=True,
+            data={'body': _attribution(cm['user'], cm['created_at']) + (cm['body'] or '')},
+        )
+    #END FOR
+#END DEF
+
+def create_issues(issues, repo:str, host:str, creds:tuple, state_dir:str=None, **kwargs) -> bool:
+    """Creates Issues (and their comments) for the specified repository, in the order they are given.
+
+    Arguments:
+        issues (iterable): The Issues to create, as given by `download_issues`. May be a generator.
+        repo (str): The destination Repo.
+        host (str): The destination Github Host.
+        creds (tuple): The credentials for authentication.
+        state_dir (str): The directory to keep source-to-destination ID mappings in. Default=None (temporary)
+
+    Returns:
+        bool: The Issues were successfully created
+
+    Raises:
+        RuntimeError: The call to create the specified data on the Github repository failed in an unexpected way
+
+    Issues are created one at a time, in order, and the number each one was given is appended to a mapping file
+    straight away. Milestones are looked up in the mapping written by `create_milestones`. The comments of each
+    issue are then written by up to COMMENT_WRITE_WORKERS threads (the comments of any one issue stay in order),
+    with at most that many issues' comments waiting at a time so memory use stays flat.
+
+    Re-running with the same `state_dir` skips issues that were already created, and finishes closing them and
+    writing the comments of any issue that was interrupted.
+    """
+    repo_state_dir = _get_state_dir(state_dir, repo, host)
+    milestone_map = _read_id_map(os.path.join(repo_state_dir, MILESTONE_MAP_FILE))
+    issue_map_path = os.path.join(repo_state_dir, ISSUE_MAP_FILE)
+    issue_map = _read_id_map(issue_map_path)
+    comments_done_path = os.path.join(repo_state_dir, COMMENTS_DONE_FILE)
+    comments_done = set(_read_id_map(comments_done_path))
+    comments_done_lock = threading.Lock()
+    comment_slots = threading.BoundedSemaphore(COMMENT_WRITE_WORKERS * 2)
+    comment_errors = []
+
+    def _comment_task(source_number, issue_number, comments, skip):
+        try:
+            _create_comments(comments, skip, issue_number, repo, host, creds)
+            _append_line(comments_done_path, "{} {}".format(source_number, issue_number), lock=comments_done_lock)
+        except (Exception) as e:
+            comment_errors.append((source_number, e))
+        finally:
+            comment_slots.release()
+    #END DEF
+
+    with ThreadPoolExecutor(max_workers=COMMENT_WRITE_WORKERS) as executor:
+        for issue in issues:
+            if comment_errors:
+                break
+            skip = 0
+            if issue['number'] in issue_map:
+                if issue['number'] in comments_done:
+                    continue
+                issue_number = issue_map[issue['number']]
+                res = gitmover_api.do_send('GET', host, "repos/{}/issues/{}".format(repo, issue_number), creds)
+                destination_issue = json.loads(res.content)
+                issue_state, skip = destination_issue['state'], destination_issue['comments']
+            else:
+                uri = "repos/{}/issues".format(repo)
+                data = {
+                    'title': issue['title'],
+                    'body': _attribution(issue['user'], issue['created_at']) + (issue['body'] or ''),
+                    'labels': issue['labels'],
+                }
+                if issue['milestone'] in milestone_map:
+                    data['milestone'] = milestone_map[issue['milestone']]
+                try:
+                    res = gitmover_api.do_send('POST', host, uri, creds, do_wait=True, data=data)
+                except (GitMoverApiCallError) as e:
+                    api_res = e.get_api_response()
+                    if api_res.status_code == 422:
+                        vprint(
+                            "--- API Response from `POST` to `{}` gave HTTP response code 422. ".format(uri) +
+                            "The issue #{} was invalid.".format(issue['number'])
+                        )
+                        return False
+                    else:
+                        raise RuntimeError("Unknown error while creating Issue.") from e
+                #END TRY/EXCEPT
+                issue_number = json.loads(res.content)['number']
+                issue_state = 'open'
+                _append_line(issue_map_path, "{} {}".format(issue['number'], issue_number))
+            #END IF/ELSE
+            #Also done when resuming, in case the issue was created but closing it failed
+            if issue['state'] == 'closed' and issue_state != 'closed':
+                gitmover_api.do_send(
+                    'PATCH', host, "repos/{}/issues/{}".format(repo, issue_number), creds, data={'state': 'closed'},
+                )
+
+            comment_slots.acquire()
+            executor.submit(_comment_task, issue['number'], issue_number, issue['comments'], skip)
+        #END FOR
+    #END WITH
+
+    if comment_errors:
+        raise RuntimeError("Failed to create the comments of issue #{}. {}".format(comment_errors[0][0], comment_errors[0][1]))
+    return True
+#END DEF
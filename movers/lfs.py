@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# IMPORTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+import urllib3
+from . import api as gitmover_api
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# CONSTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+LFS_POINTER_VERSION = b'version https://git-lfs.github.com/spec/v1'
+LFS_POINTER_MAX_SIZE = 1024
+LFS_MEDIA_TYPE = 'application/vnd.git-lfs+json'
+LFS_BATCH_SIZE = 100
+LFS_CHUNK_SIZE = 1024 * 1024
+LFS_VERIFIED_DOMAINS = [
+    'github.com',
+    'githubusercontent.com',
+]
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# FUNCTIONS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# Replaced by `git_mover._define_verbose_print` once the script's arguments have been parsed.
+vprint = lambda *a: None
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   POINTER FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def _parse_pointer(content:bytes) -> tuple:
+    """Parses the contents of a blob as a Git LFS pointer file.
+
+    Arguments:
+        content (bytes): The contents of the blob.
+
+    Returns:
+        tuple: (oid, size) of the LFS object the pointer refers to, or None if the blob is not a pointer.
+    """
+    if not content.startswith(LFS_POINTER_VERSION):
+        return None
+    oid, size = None, None
+    for line in content.split(b'\n'):
+        if line.startswith(b'oid sha256:'):
+            oid = line[len(b'oid sha256:'):].strip().decode('ascii')
+        elif line.startswith(b'size '):
+            size = int(line[len(b'size '):].strip())
+    #END FOR
+    if oid is None or size is None:
+        return None
+    return oid, size
+#END DEF
+
+def _feed_pointer_candidates(batch_check_out, batch_in) -> None:
+    """Writes the names of the blobs that are small enough to be pointer files to `git cat-file --batch`.
+
+    Arguments:
+        batch_check_out (file): The output of `git cat-file --batch-check='%(objecttype) %(objectname) %(objectsize)'`.
+        batch_in (file): The input of `git cat-file --batch`. Closed once every object has been checked.
+
+    Returns:
+        None
+    """
+    try:
+        for line in batch_check_out:
+            obj_type, obj_name, obj_size = line.split()
+            if obj_type == b'blob' and len(LFS_POINTER_VERSION) <= int(obj_size) <= LFS_POINTER_MAX_SIZE:
+                batch_in.write(obj_name + b'\n')
+        #END FOR
+    finally:
+        batch_in.close()
+    #END TRY/FINALLY
+#END DEF
+
+def find_lfs_objects(git_dir:str) -> dict:
+    """Finds every LFS object referenced by a pointer file in any ref of a local repository.
+
+    Arguments:
+        git_dir (str): The local (bare) repository directory.
+
+    Returns:
+        dict: A mapping of LFS object ID (SHA-256) to its size in bytes.
+
+    Raises:
+        RuntimeError: Listing or reading the repository's objects failed.
+
+    Every reachable object is listed with `git rev-list --all --objects`, and only blobs small enough to be
+    pointer files are read with `git cat-file --batch`, so the contents of large blobs are never loaded. The small
+    blobs are streamed through it and parsed one at a time, however many of them the repository has.
+    """
+    rev_list = subprocess.Popen(['git', '-C', git_dir, 'rev-list', '--all', '--objects', '--no-object-names'], stdout=subprocess.PIPE)
+    batch_check = subprocess.Popen(
+        ['git', '-C', git_dir, 'cat-file', '--buffer', '--batch-check=%(objecttype) %(objectname) %(objectsize)'],
+        stdin=rev_list.stdout, stdout=subprocess.PIPE,
+    )
+    rev_list.stdout.close()
+    batch = subprocess.Popen(['git', '-C', git_dir, 'cat-file', '--batch'], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    feeder = threading.Thread(target=_feed_pointer_candidates, args=(batch_check.stdout, batch.stdin), daemon=True)
+    feeder.start()
+
+    lfs_objects = {}
+    #`git cat-file --batch` output is "<sha> <type> <size>\n<contents>\n" for each object
+    header = batch.stdout.readline()
+    while header:
+        obj_size = int(header.split()[2])
+        pointer = _parse_pointer(batch.stdout.read(obj_size + 1)[:obj_size])
+        if pointer is not None:
+            lfs_objects[pointer[0]] = pointer[1]
+        header = batch.stdout.readline()
+    #END WHILE
+    feeder.join()
+    if batch_check.wait() != 0 or rev_list.wait() != 0:
+        raise RuntimeError("Failed to list the objects in '{}'.".format(git_dir))
+    if batch.wait() != 0:
+        raise RuntimeError("Failed to read the objects in '{}'.".format(git_dir))
+    return lfs_objects
+#END DEF
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   LFS API FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def _get_lfs_url(clone_url:str) -> str:
+    """Gets the base URL of a repository's LFS API.
+
+    Arguments:
+        clone_url (str): The URL of the repository, as given by the Github API (`clone_url`).
+
+    Returns:
+        str: The LFS API URL (eg. `https://github.com/owner/repo.git/info/lfs/`).
+    """
+    if not clone_url.endswith('.git'):
+        clone_url += '.git'
+    return clone_url + '/info/lfs/'
+#END DEF
+
+def _verify_ssl(url:str) -> bool:
+    """Whether to verify the SSL certificate of an LFS server. Like `movers.api.do_send`, only Github's own servers are verified.
+
+    Arguments:
+        url (str): The URL being requested.
+
+    Returns:
+        bool: True if the URL is on one of the LFS_VERIFIED_DOMAINS.
+    """
+    netloc = urlparse(url).netloc
+    return any([(netloc == domain or netloc.endswith('.' + domain)) for domain in LFS_VERIFIED_DOMAINS])
+#END DEF
+
+def lfs_batch(clone_url:str, creds:tuple, operation:str, lfs_objects:dict) -> list:
+    """Sends requests to a repository's LFS Batch API, in batches of LFS_BATCH_SIZE objects.
+
+    Arguments:
+        clone_url (str): The URL of the repository, as given by the Github API (`clone_url`).
+        creds (tuple): The credentials for authentication.
+        operation (str): Either 'download' or 'upload'.
+        lfs_objects (dict): A mapping of LFS object ID to its size in bytes.
+
+    Returns:
+        list: The object dictionaries returned by the server. For an 'upload', objects the server already
+            has are returned without any 'actions'. Objects the server rejected have an 'error' instead.
+
+    Raises:
+        GitMoverApiCallError: The LFS server gave an invalid response.
+    """
+    lfs_url = _get_lfs_url(clone_url)
+    oids = list(lfs_objects)
+    batch_results = []
+    for idx in range(0, len(oids), LFS_BATCH_SIZE):
+        res = gitmover_api.do_send(
+            'POST', lfs_url, 'objects/batch', creds,
+            data={
+                'operation': operation,
+                'transfers': ['basic'],
+                'objects': [{'oid': oid, 'size': lfs_objects[oid]} for oid in oids[idx:idx + LFS_BATCH_SIZE]],
+            },
+            accept_header=LFS_MEDIA_TYPE, extra_headers={'Content-type': LFS_MEDIA_TYPE},
+            verify=_verify_ssl(lfs_url),
+        )
+        batch_results += json.loads(res.content)['objects']
+    #END FOR
+    return batch_results
+#END DEF
+
+def _send_action(method:str, action:dict, creds:tuple, lfs_url:str, **kwargs) -> requests.Response:
+    """Sends the HTTP request described by an 'actions' entry of an LFS Batch API response.
+
+    Arguments:
+        method (str): The HTTP Method.
+        action (dict): The action, with an 'href' and optional 'header' dictionary.
+        creds (tuple): The credentials to use if the action does not include its own 'Authorization' header.
+        lfs_url (str): The URL of the LFS API that returned the action (see `_get_lfs_url`).
+        **kwargs: Passed on to `requests.request` (eg. `data`, `json`, `stream`).
+
+    Returns:
+        requests.Response: The response from the LFS server.
+
+    Raises:
+        requests.HTTPError: The LFS server gave an invalid response.
+
+    The credentials are only sent to the same host as `lfs_url`. An action may point at a separate storage
+    service (eg. a pre-signed S3 URL), which must not receive them and would reject a second kind of auth.
+    """
+    urllib3.disable_warnings()
+    headers = action.get('header', {})
+    same_host = urlparse(action['href']).netloc == urlparse(lfs_url).netloc
+    res = requests.request(
+        method, action['href'], headers=headers,
+        auth=creds if same_host and 'Authorization' not in headers else None,
+        verify=_verify_ssl(action['href']), **kwargs
+    )
+    res.raise_for_status()
+    return res
+#END DEF
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   TRANSFER FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def _cache_path(cache_dir:str, oid:str) -> str:
+    """Gets the path of an LFS object in the local content-addressed cache (laid out like `.git/lfs/objects`).
+
+    Arguments:
+        cache_dir (str): The cache directory.
+        oid (str): The LFS object ID.
+
+    Returns:
+        str: The path the object is (or would be) stored at.
+    """
+    return os.path.join(cache_dir, oid[0:2], oid[2:4], oid)
+#END DEF
+
+def _download_object(lfs_object:dict, creds:tuple, lfs_url:str, cache_dir:str) -> None:
+    """Downloads one LFS object into the cache, verifying its checksum.
+
+    Arguments:
+        lfs_object (dict): The object, as returned by an LFS Batch API 'download' request.
+        creds (tuple): The credentials for the source repository.
+        lfs_url (str): The URL of the source repository's LFS API.
+        cache_dir (str): The cache directory.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: The server did not offer the object, or the downloaded content does not match its ID.
+    """
+    oid = lfs_object['oid']
+    if 'download' not in lfs_object.get('actions', {}):
+        raise RuntimeError("LFS object '{}' cannot be downloaded from the source. {}".format(oid, lfs_object.get('error')))
+    object_path = _cache_path(cache_dir, oid)
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+
+    digest = hashlib.sha256()
+    temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(object_path))
+    try:
+        with os.fdopen(temp_fd, 'wb') as out_file:
+            with _send_action('GET', lfs_object['actions']['download'], creds, lfs_url, stream=True) as res:
+                for chunk in res.iter_content(chunk_size=LFS_CHUNK_SIZE):
+                    digest.update(chunk)
+                    out_file.write(chunk)
+        #END WITH
+        if digest.hexdigest() != oid:
+            raise RuntimeError("Downloaded LFS object '{}' does not match its checksum.".format(oid))
+        os.replace(temp_path, object_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    #END TRY/FINALLY
+#END DEF
+
+def _upload_object(lfs_object:dict, creds:tuple, lfs_url:str, cache_dir:str) -> None:
+    """Uploads one LFS object from the cache, and verifies it if the server asks for it.
+
+    Arguments:
+        lfs_object (dict): The object, as returned by an LFS Batch API 'upload' request.
+        creds (tuple): The credentials for the destination repository.
+        lfs_url (str): The URL of the destination repository's LFS API.
+        cache_dir (str): The cache directory.
+
+    Returns:
+        None
+    """
+    with open(_cache_path(cache_dir, lfs_object['oid']), 'rb') as in_file:
+        _send_action('PUT', lfs_object['actions']['upload'], creds, lfs_url, data=in_file)
+    if 'verify' in lfs_object['actions']:
+        _send_action('POST', lfs_object['actions']['verify'], creds, lfs_url, json={'oid': lfs_object['oid'], 'size': lfs_object['size']})
+#END DEF
+
+def migrate_lfs_objects(
+        git_dir:str, source_clone_url:str, source_creds:tuple, destinations:list,
+        cache_dir:str, max_workers:int=8
+) -> dict:
+    """Copies the LFS objects referenced by a local clone from the source repository to every destination.
+
+    Arguments:
+        git_dir (str): The local (bare) clone of the source repository.
+        source_clone_url (str): The URL of the source repository, as given by the Github API (`clone_url`).
+        source_creds (tuple): The credentials for the source repository.
+        destinations (list): A list of (clone_url, creds) tuples for the destination repositories.
+        cache_dir (str): A local directory to keep downloaded LFS objects in. Sharing it between repositories
+            means an object used by several repositories is only downloaded once.
+        max_workers (int): How many objects may be transferred at the same time. Default=8
+
+    Returns:
+        dict: Counts of the LFS objects that were 'found', 'downloaded', 'uploaded', and 'skipped' (because
+            a destination already had them).
+
+    Raises:
+        GitMoverApiCallError: An LFS Batch API request failed.
+        RuntimeError: An LFS object could not be transferred, or a destination rejected it.
+
+    Each destination's Batch API is asked which objects it is missing first, so only those are downloaded
+    (unless already in the cache) and uploaded.
+    """
+    stats = {'found': 0, 'downloaded': 0, 'uploaded': 0, 'skipped': 0}
+    lfs_objects = find_lfs_objects(git_dir)
+    stats['found'] = len(lfs_objects)
+    if not lfs_objects:
+        return stats
+
+    uploads = []
+    rejected = []
+    for dest_clone_url, dest_creds in destinations:
+        for lfs_object in lfs_batch(dest_clone_url, dest_creds, 'upload', lfs_objects):
+            if 'error' in lfs_object:
+                rejected.append("'{}' on {} ({})".format(lfs_object['oid'], dest_clone_url, lfs_object['error'].get('message')))
+            elif 'upload' in lfs_object.get('actions', {}):
+                uploads.append((lfs_object, dest_creds, _get_lfs_url(dest_clone_url)))
+            else:
+                stats['skipped'] += 1
+        #END FOR
+    #END FOR
+    if rejected:
+        raise RuntimeError("LFS object(s) cannot be uploaded to the destination. {}".format('; '.join(rejected)))
+    missing = {
+        lfs_object['oid']: lfs_object['size'] for lfs_object, _, _ in uploads
+        if not os.path.isfile(_cache_path(cache_dir, lfs_object['oid']))
+    }
+    vprint("----- {} LFS object(s) found; {} to upload, {} to download".format(len(lfs_objects), len(uploads), len(missing)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if missing:
+            downloads = lfs_batch(source_clone_url, source_creds, 'download', missing)
+            list(executor.map(lambda lfs_object: _download_object(lfs_object, source_creds, _get_lfs_url(source_clone_url), cache_dir), downloads))
+            stats['downloaded'] = len(downloads)
+        list(executor.map(lambda upload: _upload_object(*upload, cache_dir), uploads))
+        stats['uploaded'] = len(uploads)
+    #END WITH
+    return stats
+#END DEF
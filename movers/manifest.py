@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# IMPORTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import argparse
+import csv
+import json
+import os
+import re
+from . import args as gitmover_args
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# CONSTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+MANIFEST_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+#Separates several destination hosts in one CSV cell
+MANIFEST_LIST_SEPARATOR = ';'
+RESULT_SUCCESS = 'success'
+RESULT_FAILURE = 'failure'
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# FUNCTIONS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   MANIFEST FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def get_manifest_format(manifest_path:str) -> str:
+    """Gets the format of a manifest file from its extension.
+
+    Arguments:
+        manifest_path (str): The manifest file.
+
+    Returns:
+        str: 'csv' or 'jsonl'.
+
+    Raises:
+        RuntimeError: The extension of the manifest file is not one of MANIFEST_FORMATS.
+    """
+    extension = os.path.splitext(manifest_path)[1].lower()
+    if extension not in MANIFEST_FORMATS:
+        raise RuntimeError("Manifest '{}' must be a file ending in one of: {}".format(
+            manifest_path, ', '.join(MANIFEST_FORMATS),
+        ))
+    return MANIFEST_FORMATS[extension]
+#END DEF
+
+def read_manifest(manifest_path:str):
+    """Reads the rows of a manifest file one at a time, without loading the whole file.
+
+    Arguments:
+        manifest_path (str): The manifest file, either CSV (with a header row) or JSON Lines.
+
+    Returns:
+        generator: Yields (row_number, row) tuples. `row` is a dictionary of the row's columns; it is not
+            validated (see `parse_row`). Blank lines are skipped. Row numbers start at 1, after any header.
+
+    Raises:
+        RuntimeError: The manifest file has an unknown extension.
+    """
+    manifest_format = get_manifest_format(manifest_path)
+    with open(manifest_path, 'r', newline='') as in_file:
+        if manifest_format == 'csv':
+            for row_number, row in enumerate(csv.DictReader(in_file), start=1):
+                yield row_number, row
+        else:
+            row_number = 0
+            for line in in_file:
+                if not line.strip():
+                    continue
+                row_number += 1
+                try:
+                    row = json.loads(line)
+                except (ValueError) as e:
+                    yield row_number, {'error': "Row is not valid JSON. {}".format(e)}
+                    continue
+                #END TRY/EXCEPT
+                if not isinstance(row, dict):
+                    row = {'error': "Row is not a JSON object."}
+                yield row_number, row
+            #END FOR
+        #END IF/ELSE
+    #END WITH
+#END DEF
+
+def iter_rows(args:argparse.Namespace):
+    """Gets the repositories to process, from the manifest file or from the command line.
+
+    Arguments:
+        args (argparse.Namespace): The validated arguments of the `git_mover` script.
+
+    Returns:
+        generator: Yields (row_number, row) tuples, as `read_manifest` does.
+    """
+    if args.manifest is not None:
+        yield from read_manifest(args.manifest)
+        return
+    for idx in range(len(args.source_repo)):
+        yield idx + 1, {'source_repo': args.source_repo[idx], 'destination_repo': args.destination_repo[idx]}
+    #END FOR
+#END DEF
+
+def _get_cell(row:dict, column:str) -> str:
+    """Gets a cell of a manifest row, treating a missing or blank cell as not given.
+
+    Arguments:
+        row (dict): The manifest row.
+        column (str): The column's name.
+
+    Returns:
+        str: The stripped value of the cell, or None. List values (from JSON Lines) are joined with commas.
+    """
+    value = row.get(column)
+    if isinstance(value, list):
+        value = ','.join([str(v) for v in value])
+    if value is None or not str(value).strip():
+        return None
+    return str(value).strip()
+#END DEF
+
+def parse_row(row:dict) -> dict:
+    """Validates one row of a manifest.
+
+    Arguments:
+        row (dict): The row, as given by `read_manifest`.
+
+    Returns:
+        dict: The row's settings:
+            'source_repo' (str): The source repository.
+            'destination_repo' (str): The destination repository. The source repository if not given, or '.'.
+            'githubData' (str): Overrides `--githubData` for this row: a comma-separated list of types, 'all',
+                or 'none'. None if not given.
+            'destinationHost' (list): Overrides `--destinationHost` for this row. None if not given.
+
+    Raises:
+        RuntimeError: The row is invalid.
+    """
+    if 'error' in row:
+        raise RuntimeError(row['error'])
+    srepo = _get_cell(row, 'source_repo')
+    if srepo is None or re.match(gitmover_args.GIT_REPO_REGEX, srepo) is None:
+        raise RuntimeError("Source Repository '{}' is not a valid repository name.".format(srepo))
+    drepo = _get_cell(row, 'destination_repo')
+    if drepo is None or drepo == '.':
+        drepo = srepo
+    elif re.match(gitmover_args.GIT_REPO_REGEX, drepo) is None:
+        raise RuntimeError("Destination Repository '{}' is not a valid repository name.".format(drepo))
+    dhosts = _get_cell(row, 'destinationHost')
+    if dhosts is not None:
+        dhosts = [v.strip() for v in dhosts.replace(MANIFEST_LIST_SEPARATOR, ',').split(',') if v.strip()]
+    return {
+        'source_repo': srepo,
+        'destination_repo': drepo,
+        'githubData': _get_cell(row, 'githubData'),
+        'destinationHost': dhosts,
+    }
+#END DEF
+
+def get_row_arguments(entry:dict, args:argparse.Namespace, all_credentials:dict) -> tuple:
+    """Applies the overrides of a manifest row to the script's arguments.
+
+    Arguments:
+        entry (dict): The row's settings, as given by `parse_row`.
+        args (argparse.Namespace): The validated arguments of the `git_mover` script. Not modified.
+        all_credentials (dict): The credentials for the source, and a list of credentials for the destinations.
+
+    Returns:
+        tuple: (row_args, row_credentials) Copies of `args` and `all_credentials` with the row's overrides applied.
+
+    Raises:
+        RuntimeError: The row names a destination host that was not given with `--destinationHost`.
+
+    A row can only pick destinations out of the `--destinationHost` values, since those are the hosts that
+    credentials were given for.
+    """
+    row_args = argparse.Namespace(**vars(args))
+    row_credentials = dict(all_credentials)
+
+    if entry['githubData'] is not None:
+        github_data = entry['githubData'].replace(' ', '')
+        if github_data.lower() == 'none':
+            if 'githubData' in row_args:
+                del row_args.githubData
+        else:
+            row_args.githubData = '' if github_data.lower() == 'all' else github_data
+    #END IF
+
+    if entry['destinationHost'] is not None:
+        row_args.destinationHost = []
+        row_credentials['dst'] = []
+        for dhost in entry['destinationHost']:
+            clean_dhost = gitmover_args._clean_host(dhost)
+            if clean_dhost not in args.destinationHost:
+                raise RuntimeError("Destination host '{}' was not given with `--destinationHost`.".format(dhost))
+            row_args.destinationHost.append(clean_dhost)
+            row_credentials['dst'].append(all_credentials['dst'][args.destinationHost.index(clean_dhost)])
+        #END FOR
+    #END IF
+    return row_args, row_credentials
+#END DEF
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   RESULTS FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def read_successful(results_path:str) -> set:
+    """Gets the repositories that a results file records as successfully migrated.
+
+    Arguments:
+        results_path (str): The JSON Lines results file. May not exist yet.
+
+    Returns:
+        set: (source_repo, destination_repo) tuples.
+    """
+    successful = set()
+    if results_path is None or not os.path.isfile(results_path):
+        return successful
+    with open(results_path, 'r') as in_file:
+        for line in in_file:
+            try:
+                result = json.loads(line)
+            except (ValueError):
+                #The last line of an interrupted run may be incomplete
+                continue
+            #END TRY/EXCEPT
+            if result.get('outcome') == RESULT_SUCCESS:
+                successful.add((result['source_repo'], result['destination_repo']))
+        #END FOR
+    #END WITH
+    return successful
+#END DEF
+
+def append_result(results_path:str, result:dict) -> None:
+    """Appends the outcome of one repository to a results file, as soon as it is known.
+
+    Arguments:
+        results_path (str): The JSON Lines results file. Created if it does not exist.
+        result (dict): The outcome of the repository.
+
+    Returns:
+        None
+    """
+    with open(results_path, 'a') as out_file:
+        out_file.write(json.dumps(result) + '\n')
+        out_file.flush()
+        os.fsync(out_file.fileno())
+    #END WITH
+#END DEF
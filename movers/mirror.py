@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# IMPORTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from . import api as gitmover_api
+from . import args as gitmover_args
+from . import records as gitmover_records
+from . import repo as gitmover_repo
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# CONSTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+MIRROR_EVENT_TYPES = [
+    'PushEvent',
+    'CreateEvent',
+    'DeleteEvent',
+    'ReleaseEvent',
+]
+MIRROR_RELEASE_ACTIONS = [
+    'published',
+    'created',
+]
+MIRROR_REF_SPECS = [
+    '+refs/heads/*:refs/heads/*',
+    '+refs/tags/*:refs/tags/*',
+]
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# FUNCTIONS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+# Replaced by `git_mover._define_verbose_print` once the script's arguments have been parsed.
+vprint = lambda *a: None
+
+def _clamp_interval(interval:int) -> int:
+    """Keeps a polling interval within the bounds allowed for the mirror daemon.
+
+    Arguments:
+        interval (int): The requested polling interval, in seconds.
+
+    Returns:
+        int: The interval, no lower than DAEMON_POLL_INTERVAL_MIN and no higher than DAEMON_POLL_INTERVAL_MAX.
+    """
+    return max(gitmover_args.DAEMON_POLL_INTERVAL_MIN, min(interval, gitmover_args.DAEMON_POLL_INTERVAL_MAX))
+#END DEF
+
+def poll_events(repo:str, host:str, creds:tuple, etag:str=None, last_event_id:int=None) -> tuple:
+    """Conditionally polls the Events API of the given repository for anything new since the last poll.
+
+    Arguments:
+        repo (str): The Repo we are polling.
+        host (str): The Github Host that we will be connecting to.
+        creds (tuple): The credentials for authentication.
+        etag (str): The 'ETag' header from the previous poll of this repository. Default=None
+        last_event_id (int): The ID of the newest event seen by the previous poll, or None if this repository has
+            not been polled yet. Default=None
+
+    Returns:
+        tuple: (etag, last_event_id, events, poll_interval)
+            etag (str): The 'ETag' to send with the next poll.
+            last_event_id (int): The ID of the newest event seen so far, or 0 if the repository has no events yet.
+            events (list): The new events that could change refs or releases, oldest first.
+            poll_interval (int): The server's requested minimum polling interval ('X-Poll-Interval'), or 0.
+
+    When an ETag is given, the request is sent with 'If-None-Match' so that an unchanged event list is answered
+    with a `304 Not Modified`, which Github does not count against the rate limit. On the first poll of a repository
+    (`last_event_id` is None) no events are returned; the daemon does a full sync of that repository instead.
+    """
+    extra_headers = {}
+    if etag is not None:
+        extra_headers['If-None-Match'] = etag
+    res = gitmover_api.do_send(
+        'GET', host, "repos/{}/events?per_page=100".format(repo), creds,
+        extra_headers=extra_headers, expected_code_max=304,
+    )
+    poll_interval = int(res.headers.get('X-Poll-Interval', 0))
+    if res.status_code == 304:
+        return etag, last_event_id, [], poll_interval
+
+    new_events = []
+    newest_event_id = last_event_id
+    for event in json.loads(res.content):
+        event_id = int(event['id'])
+        if last_event_id is not None and event_id <= last_event_id:
+            continue
+        if newest_event_id is None or event_id > newest_event_id:
+            newest_event_id = event_id
+        if event['type'] in MIRROR_EVENT_TYPES:
+            new_events.append(event)
+    #END FOR
+    if last_event_id is None:
+        new_events = []
+        #A repository without any (unexpired) events has still been polled, so its first event must not be dropped
+        if newest_event_id is None:
+            newest_event_id = 0
+    #END IF
+    #The Events API lists the newest event first
+    new_events.reverse()
+    return res.headers.get('ETag'), newest_event_id, new_events, poll_interval
+#END DEF
+
+def init_mirror(source_clone_url:str, creds:tuple, mirror_dir:str, object_store:str=None) -> None:
+    """Prepares the local bare repository used to mirror a source repository.
+
+    Arguments:
+        source_clone_url (str): The full URL to use when fetching from the source repository.
+        creds (tuple): The credentials for the source repository.
+        mirror_dir (str): The directory holding the local mirror. Created if it does not exist.
+        object_store (str): The directory of a shared object store for a new mirror to borrow objects from. Default=None
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: The local mirror could not be created.
+
+    An existing mirror directory is reused (only its remote URL is refreshed), so restarting the daemon with the
+    same `--mirrorDir` does not download the repository's history again.
+    """
+    full_source_clone_url = gitmover_repo._get_authenticated_url(source_clone_url, creds)
+    if not os.path.isdir(os.path.join(mirror_dir, 'objects')):
+        os.makedirs(mirror_dir, exist_ok=True)
+        res = gitmover_repo._git(['init', '--bare', '--quiet', mirror_dir])
+        if res.returncode != 0:
+            raise RuntimeError("Failed to create local mirror '{}'. {}".format(mirror_dir, res.stderr))
+        for ref_spec in MIRROR_REF_SPECS:
+            gitmover_repo._git(['config', '--add', 'remote.origin.fetch', ref_spec], git_dir=mirror_dir)
+        if object_store is not None:
+            gitmover_repo._init_object_store(object_store)
+            with open(os.path.join(mirror_dir, 'objects', 'info', 'alternates'), 'w') as alternates_file:
+                alternates_file.write(os.path.join(os.path.abspath(object_store), 'objects') + '\n')
+    #END IF
+    gitmover_repo._git(['config', 'remote.origin.url', full_source_clone_url], git_dir=mirror_dir)
+#END DEF
+
+def sync_refs(mirror_dir:str, destinations:list, full_sync:bool=False) -> list:
+    """Fetches new refs from the source into the local mirror, and pushes only the changed refs to the destinations.
+
+    Arguments:
+        mirror_dir (str): The directory holding the local mirror (see `init_mirror`).
+        destinations (list): A list of (clone_url, creds) tuples for the destination repositories to push to.
+        full_sync (bool): Push every branch and tag (pruning any the source no longer has), instead of only
+            the refs that changed during this fetch. Default=False
+
+    Returns:
+        list: The refspecs that were pushed to the destinations. Empty if nothing changed.
+
+    Raises:
+        RuntimeError: The fetch from the source or the push to any of the destinations failed.
+    """
+    refs_before = gitmover_repo._list_refs(mirror_dir)
+    res = gitmover_repo._git(['fetch', '--prune', '--quiet', 'origin'], git_dir=mirror_dir)
+    if res.returncode != 0:
+        raise RuntimeError("Failed to fetch from source repository. {}".format(res.stderr))
+    refs_after = gitmover_repo._list_refs(mirror_dir)
+
+    if full_sync:
+        push_args = ['--prune'] + MIRROR_REF_SPECS
+    else:
+        push_args = [
+            '+{0}:{0}'.format(ref_name)
+            for ref_name, sha in refs_after.items()
+            if refs_before.get(ref_name) != sha
+        ]
+        push_args += [':{}'.format(ref_name) for ref_name in refs_before if ref_name not in refs_after]
+        if not push_args:
+            return []
+    #END IF/ELSE
+
+    failed_pushes = []
+    for destination_clone_url, creds in destinations:
+        full_destination_clone_url = gitmover_repo._get_authenticated_url(destination_clone_url, creds)
+        res = gitmover_repo._git(['push', '--quiet', full_destination_clone_url] + push_args, git_dir=mirror_dir)
+        if res.returncode != 0:
+            failed_pushes.append("{} ({})".format(destination_clone_url, res.stderr.strip()))
+    #END FOR
+    if failed_pushes:
+        raise RuntimeError("Failed to push to destination repository. {}".format('; '.join(failed_pushes)))
+    return push_args
+#END DEF
+
+def sync_releases(events:list, repo:str, host:str, creds:tuple) -> int:
+    """Creates the releases published in the given events on the destination repository.
+
+    Arguments:
+        events (list): New events from `poll_events`. Only 'ReleaseEvent's are used.
+        repo (str): The destination Repo.
+        host (str): The destination Github Host.
+        creds (tuple): The credentials for the destination repository.
+
+    Returns:
+        int: The number of releases that were created.
+    """
+    created = 0
+    for event in events:
+        if event['type'] != 'ReleaseEvent' or event['payload'].get('action') not in MIRROR_RELEASE_ACTIONS:
+            continue
+        release = gitmover_records.Release.from_json(event['payload']['release'])
+        if gitmover_repo.create_releases([release], repo, host, creds):
+            created += 1
+        else:
+            vprint("----- Release '{}' was not created on '{}'; it may already exist.".format(release.tag_name, repo))
+    #END FOR
+    return created
+#END DEF
+
+def _poll_and_sync(pair:dict, source_host:str, all_creds:dict, poll_interval:int) -> int:
+    """Polls one source repository and brings its destinations up to date. Run on the daemon's worker threads.
+
+    Arguments:
+        pair (dict): The daemon's state for one source repository and its destinations. Updated in place.
+        source_host (str): The source Github Host.
+        all_creds (dict): A dictionary containing the credentials for both the source and destination API.
+        poll_interval (int): The configured polling interval, in seconds.
+
+    Returns:
+        int: The number of seconds to wait before polling this pair again.
+
+    The pair's ETag and last event ID are only updated once every destination has been synced, so that a failed
+    sync polls the same events again (and creates their releases) when it is retried.
+    """
+    etag, last_event_id, events, server_interval = poll_events(
+        pair['source_repo'], source_host, all_creds['src'], pair['etag'], pair['last_event_id'],
+    )
+    if not pair['synced'] or events:
+        #If the push fails, the fetched refs will no longer look "new", so the next sync needs to be a full one
+        full_sync = not pair['synced']
+        pair['synced'] = False
+        pushed = sync_refs(
+            pair['mirror_dir'],
+            [(dest['clone_url'], dest['creds']) for dest in pair['destinations']],
+            full_sync=full_sync,
+        )
+        pair['synced'] = True
+        if pushed:
+            print("+++ Mirrored {} ref update(s) from '{}' to '{}'".format(len(pushed), pair['source_repo'], pair['destination_repo']))
+        for dest in pair['destinations']:
+            if sync_releases(events, pair['destination_repo'], dest['host'], dest['creds']):
+                print("+++ Mirrored new release(s) from '{}' to '{}' on {}".format(pair['source_repo'], pair['destination_repo'], dest['host']))
+        #END FOR
+    #END IF
+    pair['etag'], pair['last_event_id'] = etag, last_event_id
+    return _clamp_interval(max(poll_interval, server_interval))
+#END DEF
+
+def run_daemon(
+        repo_pairs:list, source_host:str, destination_hosts:list, all_creds:dict,
+        mirror_root:str, poll_interval:int=60, max_workers:int=4, object_store:str=None
+) -> int:
+    """Continuously mirrors new refs and releases from the source repositories to their destinations.
+
+    Arguments:
+        repo_pairs (list): A list of (source_repo, destination_repo) tuples. Every destination must already exist.
+        source_host (str): The source Github Host.
+        destination_hosts (list): The destination Github Hosts. Every source repository is mirrored to all of them.
+        all_creds (dict): A dictionary containing the credentials for both the source and destination API.
+            `all_creds['dst']` is a list with one set of credentials for each of `destination_hosts`.
+        mirror_root (str): The directory under which each source repository's local mirror is kept.
+        poll_interval (int): How often to poll each source repository, in seconds. Default=60
+        max_workers (int): How many repository pairs may be polled/synced at the same time. Default=4
+        object_store (str): The directory of a shared object store for new local mirrors to borrow objects from. Default=None
+
+    Returns:
+        int: 0 once the daemon has been stopped (with Ctrl+C).
+
+    Raises:
+        GitMoverApiCallError: Information about one of the repositories could not be retrieved at start-up.
+
+    Each pair is polled no more often than its interval (which also respects any 'X-Poll-Interval' sent by the
+    server), and never while a previous poll of the same pair is still running. A pair that fails to sync is
+    retried with an exponential back-off, up to DAEMON_POLL_INTERVAL_MAX.
+    """
+    pairs = []
+    for srepo, drepo in repo_pairs:
+        srepo_info = gitmover_repo.download_repository(srepo, source_host, all_creds['src'])
+        destinations = []
+        for dhost, dcreds in zip(destination_hosts, all_creds['dst']):
+            drepo_info = gitmover_repo.download_repository(drepo, dhost, dcreds)
+            destinations.append({'host': dhost, 'creds': dcreds, 'clone_url': drepo_info.clone_url})
+        #END FOR
+        pair = {
+            'source_repo': srepo,
+            'destination_repo': drepo,
+            'destinations': destinations,
+            'mirror_dir': os.path.join(mirror_root, srepo.replace('/', '__')),
+            'etag': None,
+            'last_event_id': None,
+            'synced': False,
+            'failures': 0,
+            'next_poll': 0.0,
+        }
+        vprint("--- Preparing local mirror of '{}' in '{}'".format(srepo, pair['mirror_dir']))
+        init_mirror(srepo_info.clone_url, all_creds['src'], pair['mirror_dir'], object_store=object_store)
+        pairs.append(pair)
+    #END FOR
+
+    print("+++ Mirroring {} repositories. Press Ctrl+C to stop.".format(len(pairs)))
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while True:
+                now = time.monotonic()
+                for idx, pair in enumerate(pairs):
+                    if idx in in_flight or pair['next_poll'] > now:
+                        continue
+                    in_flight[idx] = executor.submit(_poll_and_sync, pair, source_host, all_creds, poll_interval)
+                #END FOR
+
+                next_due = min([p['next_poll'] for i, p in enumerate(pairs) if i not in in_flight], default=None)
+                timeout = gitmover_args.DAEMON_POLL_INTERVAL_MAX if next_due is None else max(0.0, next_due - time.monotonic())
+                if in_flight:
+                    wait(list(in_flight.values()), timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    time.sleep(timeout)
+
+                for idx in [i for i, f in in_flight.items() if f.done()]:
+                    pair = pairs[idx]
+                    try:
+                        interval = in_flight.pop(idx).result()
+                        pair['failures'] = 0
+                    except (Exception) as e:
+                        pair['failures'] += 1
+                        interval = _clamp_interval(poll_interval * (2 ** pair['failures']))
+                        print("+++ Failed to mirror '{}'. Retrying in {} seconds.".format(pair['source_repo'], interval))
+                        vprint("--- Exception | {}".format(e))
+                    #END TRY/EXCEPT
+                    pair['next_poll'] = time.monotonic() + interval
+                #END FOR
+            #END WHILE
+        except (KeyboardInterrupt):
+            print("+++ Stopping mirror daemon. Waiting for running syncs to finish.")
+        #END TRY/EXCEPT
+    #END WITH
+    return 0
+#END DEF
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# RECORD CLASSES
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+class _Record(object):
+    """Base class for the compact records that downloaded Github data is kept in.
+
+    Each subclass lists the fields it keeps in `__slots__`, and projects a Github API response onto them in
+    `from_json`. Everything else in the response (URLs, nested owner objects, etc.) is dropped as soon as it
+    has been parsed. `to_dict` and `from_dict` round-trip a record through plain JSON (eg. for `--export`).
+    """
+    __slots__ = ()
+
+    def __init__(self, **fields) -> None:
+        for field in self.__slots__:
+            setattr(self, field, fields.get(field))
+    #END DEF
+
+    @classmethod
+    def from_dict(cls, data:dict):
+        return cls(**data)
+    #END DEF
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+    #END DEF
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, ', '.join(
+            "{}={!r}".format(field, getattr(self, field)) for field in self.__slots__
+        ))
+    #END DEF
+#END CLASS
+
+class Repository(_Record):
+    """The fields of a repository that are needed to check, create and clone it.
+    """
+    __slots__ = (
+        'clone_url', 'description', 'homepage',
+        'private', 'has_wiki', 'archived', 'disabled', 'size',
+    )
+
+    @classmethod
+    def from_json(cls, data:dict):
+        return cls(**{field: data.get(field) for field in cls.__slots__})
+    #END DEF
+#END CLASS
+
+class Protection(_Record):
+    """The protection of a branch, already in the shape that the `PUT .../protection` API endpoint expects.
+    """
+    __slots__ = (
+        'required_status_checks', 'required_pull_request_reviews', 'restrictions',
+        'enforce_admins', 'allow_force_pushes', 'allow_deletions', 'required_linear_history',
+    )
+
+    @classmethod
+    def from_json(cls, data:dict):
+        """Projects the response of `GET .../protection` onto the fields of a `PUT .../protection` request.
+
+        Arguments:
+            data (dict): The protection of the branch. Its 'required_status_checks',
+                'required_pull_request_reviews' and 'restrictions' may be None (not enabled).
+
+        Returns:
+            Protection: The branch protection.
+        """
+        status_checks = data.get('required_status_checks')
+        if status_checks is not None:
+            status_checks = {
+                'strict': status_checks.get('strict', False),
+                'contexts': status_checks.get('contexts', []),
+            }
+        reviews = data.get('required_pull_request_reviews')
+        if reviews is not None:
+            reviews = {
+                'dismiss_stale_reviews': reviews.get('dismiss_stale_reviews', False),
+                'require_code_owner_reviews': reviews.get('require_code_owner_reviews', False),
+                'required_approving_review_count': reviews.get('required_approving_review_count', 1),
+                'dismissal_restrictions': _project_actors(reviews.get('dismissal_restrictions')) or {},
+            }
+        return cls(
+            required_status_checks=status_checks,
+            required_pull_request_reviews=reviews,
+            restrictions=_project_actors(data.get('restrictions')),
+            enforce_admins=_is_enabled(data.get('enforce_admins')),
+            allow_force_pushes=_is_enabled(data.get('allow_force_pushes')),
+            allow_deletions=_is_enabled(data.get('allow_deletions')),
+            required_linear_history=_is_enabled(data.get('required_linear_history')),
+        )
+    #END DEF
+#END CLASS
+
+class Branch(_Record):
+    """A branch, and its protection if it has any.
+    """
+    __slots__ = ('name', 'protected', 'protection')
+
+    @classmethod
+    def from_json(cls, data:dict, protection:Protection=None):
+        return cls(name=data['name'], protected=data.get('protected', False), protection=protection)
+    #END DEF
+
+    @classmethod
+    def from_dict(cls, data:dict):
+        protection = data.get('protection')
+        return cls(
+            name=data['name'], protected=data['protected'],
+            protection=None if protection is None else Protection.from_dict(protection),
+        )
+    #END DEF
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'protected': self.protected,
+            'protection': None if self.protection is None else self.protection.to_dict(),
+        }
+    #END DEF
+#END CLASS
+
+class Release(_Record):
+    """The fields of a release that are sent to the `POST .../releases` API endpoint.
+    """
+    __slots__ = ('tag_name', 'target_commitish', 'name', 'body', 'draft', 'prerelease')
+
+    @classmethod
+    def from_json(cls, data:dict):
+        return cls(**{field: data.get(field) for field in cls.__slots__})
+    #END DEF
+#END CLASS
+
+class DeployKey(_Record):
+    """The fields of a deploy key that are sent to the `POST .../keys` API endpoint.
+    """
+    __slots__ = ('title', 'key', 'read_only')
+
+    @classmethod
+    def from_json(cls, data:dict):
+        return cls(**{field: data.get(field) for field in cls.__slots__})
+    #END DEF
+#END CLASS
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# CONSTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# The record class of each type of Github data that is downloaded as a list of records
+GITHUB_DATA_RECORDS = {
+    'branches': Branch,
+    'deploy_keys': DeployKey,
+    'releases': Release,
+}
+
+
+
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# FUNCTIONS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+def _is_enabled(setting) -> bool:
+    """Reads a boolean protection setting, which the Github API returns as `{"enabled": <bool>}`.
+
+    Arguments:
+        setting (dict): The setting from the Github API. May be None, or already a bool.
+
+    Returns:
+        bool: Whether the setting is enabled.
+    """
+    if isinstance(setting, dict):
+        return bool(setting.get('enabled', False))
+    return bool(setting)
+#END DEF
+
+def _project_actors(actors:dict) -> dict:
+    """Reduces the users/teams/apps of a branch protection restriction to their logins and slugs.
+
+    Arguments:
+        actors (dict): The restriction from the Github API, with lists of full user/team/app objects. May be None.
+
+    Returns:
+        dict: The restriction with lists of user logins and team/app slugs, or None if `actors` was None.
+    """
+    if actors is None:
+        return None
+    projected = {
+        'users': [user['login'] for user in actors.get('users', [])],
+        'teams': [team['slug'] for team in actors.get('teams', [])],
+    }
+    #Older Github Enterprise Servers do not return (or accept) apps
+    if 'apps' in actors:
+        projected['apps'] = [app['slug'] for app in actors.get('apps', [])]
+    return projected
+#END DEF
+
+def to_json(value):
+    """Converts a record to a plain dictionary. Meant to be passed as the `default` of `json.dump`.
+
+    Arguments:
+        value (object): The object that `json` could not serialize itself.
+
+    Returns:
+        dict: The record's fields.
+
+    Raises:
+        TypeError: The value is not a record.
+    """
+    if isinstance(value, _Record):
+        return value.to_dict()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(value).__name__))
+#END DEF
@@ -7,20 +7,130 @@ import json
 import tempfile
 import os
 import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from . import api as gitmover_api
+from . import args as gitmover_args
+from . import issues as gitmover_issues
+from . import lfs as gitmover_lfs
+from . import records as gitmover_records
 from .exceptions import GitMoverApiCallError
 
 
 
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# CONSTS
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+REPACK_MAX_THREADS = 4
+
+
+
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 # FUNCTIONS
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
+# Replaced by `git_mover._define_verbose_print` once the script's arguments have been parsed.
+vprint = lambda *a: None
+
+# Only one clone at a time may add its objects to a shared object store.
+_object_store_lock = threading.Lock()
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   GIT HELPER FUNCTIONS
+# + + + + + + + + + + + + + + + + + + + + +
+def _get_authenticated_url(clone_url:str, creds:tuple) -> str:
+    """Adds the given HTTPS credentials to a repository's clone URL.
+
+    Arguments:
+        clone_url (str): The URL of the repository, as given by the Github API (`clone_url`).
+        creds (tuple): The credentials for authentication in the following order; (username, pa-token).
+
+    Returns:
+        str: The clone URL with the username and token embedded in it.
+    """
+    url_parts = urlparse(clone_url)
+    return (
+        url_parts.scheme + '://' +
+        creds[0] + ':' + creds[1] + '@' +
+        url_parts.netloc +
+        url_parts.path
+    )
+#END DEF
+
+def _git(git_args:list, git_dir:str=None, capture:bool=True) -> subprocess.CompletedProcess:
+    """Runs the `git` command line tool with the given arguments.
+
+    Arguments:
+        git_args (list): The arguments to pass to `git` (eg. `['fetch', '--prune', 'origin']`).
+        git_dir (str): The repository directory to run the command in (passed to `git -C`). Default=None
+        capture (bool): Whether to capture the command's output, instead of letting it print to the terminal. Default=True
+
+    Returns:
+        subprocess.CompletedProcess: The result of the command. When captured, `stdout` and `stderr` are decoded strings.
+
+    Unlike `os.system`, this does not change the working directory of the process, so it is safe to call
+    from several threads at once.
+    """
+    cmd = ['git']
+    if git_dir is not None:
+        cmd += ['-C', git_dir]
+    if not capture:
+        return subprocess.run(cmd + list(git_args))
+    return subprocess.run(cmd + list(git_args), stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+#END DEF
+
+def _list_refs(git_dir:str, ref_prefixes:list=None) -> dict:
+    """Lists the refs in a local repository, and the object each one points to.
+
+    Arguments:
+        git_dir (str): The local repository directory.
+        ref_prefixes (list): Only list refs under these prefixes. Default=['refs/heads/', 'refs/tags/']
+
+    Returns:
+        dict: A mapping of full ref name (eg. 'refs/heads/main') to object SHA.
+
+    Raises:
+        RuntimeError: `git for-each-ref` failed.
+    """
+    if ref_prefixes is None:
+        ref_prefixes = ['refs/heads/', 'refs/tags/']
+    res = _git(['for-each-ref', '--format=%(refname) %(objectname)'] + ref_prefixes, git_dir=git_dir)
+    if res.returncode != 0:
+        raise RuntimeError("Failed to list refs in '{}'. {}".format(git_dir, res.stderr))
+    refs = {}
+    for line in res.stdout.splitlines():
+        ref_name, sha = line.split(' ')
+        refs[ref_name] = sha
+    #END FOR
+    return refs
+#END DEF
+
+# + + + + + + + + + + + + + + + + + + + + +
+#   GITHUB DATA DISPATCH
+# + + + + + + + + + + + + + + + + + + + + +
+def get_github_data_function(action:str, gdt:str):
+    """Gets the function that downloads or creates one type of Github data.
+
+    Arguments:
+        action (str): Either 'download' or 'create'.
+        gdt (str): The type of Github data (one of `movers.args.GITHUB_DATA_TYPES`).
+
+    Returns:
+        function: `download_<gdt>` or `create_<gdt>`, from `movers.issues` for the ISSUES_GITHUB_DATA_TYPES,
+            or from this module for the others.
+    """
+    function_name = '{}_{}'.format(action, gdt)
+    if gdt in gitmover_args.ISSUES_GITHUB_DATA_TYPES:
+        return getattr(gitmover_issues, function_name)
+    return globals()[function_name]
+#END DEF
+
 # + + + + + + + + + + + + + + + + + + + + +
 #   DOWNLOAD FUNCTIONS
 # + + + + + + + + + + + + + + + + + + + + +
-def download_repository(repo:str, host:str, creds:tuple) -> dict:
+def download_repository(repo:str, host:str, creds:tuple) -> gitmover_records.Repository:
     """Gets all of the core information for the given repository.
 
     Arguments:
@@ -29,14 +139,40 @@ def download_repository(repo:str, host:str, creds:tuple) -> dict:
         creds (tuple): The credentials for authentication.
 
     Returns:
-        dict: A JSON response from the Github server parsed into a dictionary.
+        Repository: The fields of the Github server's response that are used to create and clone the repository.
     """
     res = gitmover_api.do_send('GET', host, "repos/{}".format(repo), creds)
-    clean_res = json.loads(res.text)
-    return clean_res
+    return gitmover_records.Repository.from_json(json.loads(res.content))
 #END DEF
 
-def download_branches(repo:str, host:str, creds:tuple) -> dict:
+def _download_protection_part(repo:str, host:str, creds:tuple, branch_name:str, part:str) -> dict:
+    """Gets one part of a Branch's protection, which the Github API reports with a 404 when it is not enabled.
+
+    Arguments:
+        repo (str): The Repo we are getting information about.
+        host (str): The Github Host that we will be connecting to.
+        creds (tuple): The credentials for authentication.
+        branch_name (str): The protected Branch.
+        part (str): The part of the protection (eg. 'required_status_checks').
+
+    Returns:
+        dict: A JSON response from the Github server parsed into a dictionary, or None if the part is not enabled.
+
+    Raises:
+        RuntimeError: The Github API responded with an unexpected error.
+    """
+    try:
+        res = gitmover_api.do_send('GET', host, "repos/{}/branches/{}/protection/{}".format(repo, branch_name, part), creds)
+        return json.loads(res.content)
+    except (GitMoverApiCallError) as e:
+        api_res = e.get_api_response()
+        if api_res.status_code == 404:
+            return None
+        raise RuntimeError("Unexpected response from Github API. {}".format(api_res.text)) from e
+    #END TRY/EXCEPT
+#END DEF
+
+def download_branches(repo:str, host:str, creds:tuple) -> list:
     """Gets the extra info about the Branches for the given repository.
 
     Arguments:
@@ -45,46 +181,25 @@ def download_branches(repo:str, host:str, creds:tuple) -> dict:
         creds (tuple): The credentials for authentication.
 
     Returns:
-        dict: A JSON response from the Github server parsed into a dictionary.
+        list: A Branch record for each of the repository's branches, with the protection of the protected ones.
     """
     res = gitmover_api.do_send('GET', host, "repos/{}/branches".format(repo), creds)
-    clean_res = json.loads(res.text)
-    for branch in clean_res:
+    branches = []
+    for branch in json.loads(res.content):
+        protection = None
         if branch['protected']:
-            branch['details'] = {}
-
             br_p = gitmover_api.do_send('GET', host, "repos/{}/branches/{}/protection".format(repo, branch['name']), creds)
-            branch['details']['protection'] = json.loads(br_p.text)
-
-            br_p_rprr = gitmover_api.do_send('GET', host, "repos/{}/branches/{}/protection/required_pull_request_reviews".format(repo, branch['name']), creds)
-            branch['details']['required_pull_request_reviews'] = json.loads(br_p_rprr.text)
-
-            try:
-                br_p_rst = gitmover_api.do_send('GET', host, "repos/{}/branches/{}/protection/required_status_checks".format(repo, branch['name']), creds)
-                branch['details']['required_status_checks'] = json.loads(br_p_rst.text)
-            except (GitMoverApiCallError) as e:
-                api_res = e.get_api_response()
-                if api_res.status_code == 404:
-                    branch['details']['required_status_checks'] = None
-                else:
-                    raise RuntimeError("Unexpected response from Github API. {}".format(api_res.text)) from e
-            #END TRY/EXCEPT
-
-            try:
-                br_p_r = gitmover_api.do_send('GET', host, "repos/{}/branches/{}/protection/restrictions".format(repo, branch['name']), creds)
-                branch['details']['restrictions'] = json.loads(br_p_r.text)
-            except (GitMoverApiCallError) as e:
-                api_res = e.get_api_response()
-                if api_res.status_code == 404:
-                    branch['details']['restrictions'] = None
-                else:
-                    raise RuntimeError("Unexpected response from Github API. {}".format(api_res.text)) from e
-            #END TRY/EXCEPT
+            protection = json.loads(br_p.content)
+            for part in ['required_pull_request_reviews', 'required_status_checks', 'restrictions']:
+                protection[part] = _download_protection_part(repo, host, creds, branch['name'], part)
+            protection = gitmover_records.Protection.from_json(protection)
+        #END IF
+        branches.append(gitmover_records.Branch.from_json(branch, protection=protection))
     #END FOR
-    return clean_res
+    return branches
 #END DEF
 
-def download_deploy_keys(repo:str, host:str, creds:tuple) -> dict:
+def download_deploy_keys(repo:str, host:str, creds:tuple) -> list:
     """Gets the Deploy Keys for the given repository.
 
     Arguments:
@@ -93,14 +208,13 @@ def download_deploy_keys(repo:str, host:str, creds:tuple) -> dict:
         creds (tuple): The credentials for authentication.
 
     Returns:
-        dict: A JSON response from the Github server parsed into a dictionary.
+        list: A DeployKey record for each of the repository's deploy keys.
     """
     res = gitmover_api.do_send('GET', host, "repos/{}/keys".format(repo), creds)
-    clean_res = json.loads(res.text)
-    return clean_res
+    return [gitmover_records.DeployKey.from_json(dk) for dk in json.loads(res.content)]
 #END DEF
 
-def download_releases(repo:str, host:str, creds:tuple) -> dict:
+def download_releases(repo:str, host:str, creds:tuple) -> list:
     """Gets the Releases for the given repository.
 
     Arguments:
@@ -109,80 +223,365 @@ def download_releases(repo:str, host:str, creds:tuple) -> dict:
         creds (tuple): The credentials for authentication.
 
     Returns:
-        dict: A JSON response from the Github server parsed into a dictionary.
+        list: A Release record for each of the repository's releases.
     """
     res = gitmover_api.do_send('GET', host, "repos/{}/releases".format(repo), creds)
-    clean_res = json.loads(res.text)
-    return clean_res
+    return [gitmover_records.Release.from_json(rl) for rl in json.loads(res.content)]
 #END DEF
 
 # + + + + + + + + + + + + + + + + + + + + +
 #   CREATE REPO FUNCTIONS
 # + + + + + + + + + + + + + + + + + + + + +
-def create_repository(source_repo_info:dict, destination_repo:str, destination_host:str, creds:tuple) -> dict:
+def create_repository(
+        source_repo_info:gitmover_records.Repository, destination_repo:str, destination_host:str, creds:tuple
+) -> gitmover_records.Repository:
     """Creates a blank new repository in the destination using info from the source.
 
     Arguments:
-        source_repo_info (dict): Basic information about the source repository.
+        source_repo_info (Repository): Basic information about the source repository.
         destination_repo (str): The name of the new repository we are creating.
         destination_host (str): The Github Host that we will be connecting to.
         creds (tuple): The credentials for authentication.
 
     Returns:
-        dict: A JSON response from the Github server parsed into a dictionary.
+        Repository: Basic information about the new repository.
     """
     dest_org, dest_repo_name = destination_repo.split('/')
     new_repo = {
         "name": dest_repo_name,
-        "description": source_repo_info['description'],
-        "homepage": source_repo_info['homepage'],
-        "private": source_repo_info['private'],
+        "description": source_repo_info.description,
+        "homepage": source_repo_info.homepage,
+        "private": source_repo_info.private,
+        "has_wiki": source_repo_info.has_wiki,
         "auto_init": False,
     }
     res = gitmover_api.do_send('POST', destination_host, "orgs/{}/repos".format(dest_org), data=new_repo, creds=creds)
-    clean_res = json.loads(res.text)
-    return clean_res
+    return gitmover_records.Repository.from_json(json.loads(res.content))
 #END DEF
 
-def clone_repository(source_clone_url:str, destination_clone_url:str, all_creds:dict) -> bool:
-    """Creates a blank new repository in the destination using info from the source.
+def _push_mirror(git_dir:str, destination_clone_url:str, creds:tuple) -> bool:
+    """Pushes everything in a local bare clone to a destination repository.
 
     Arguments:
-        source_clone_url (str): The full URL to use when cloning the source repository.
+        git_dir (str): The local bare clone of the source repository.
         destination_clone_url (str): The full URL to push the cloned repository to.
+        creds (tuple): The credentials for the destination repository.
+
+    Returns:
+        bool: True if the push succeeded. False if not.
+    """
+    full_destination_clone_url = _get_authenticated_url(destination_clone_url, creds)
+    res = _git(['push', '--mirror', '--quiet', full_destination_clone_url], git_dir=git_dir)
+    if res.returncode != 0:
+        vprint("--- Push to '{}' failed | {}".format(destination_clone_url, res.stderr))
+    return res.returncode == 0
+#END DEF
+
+def _count_objects(git_dir:str) -> dict:
+    """Gets the object counts and sizes of a local repository.
+
+    Arguments:
+        git_dir (str): The local repository directory.
+
+    Returns:
+        dict: The numeric values reported by `git count-objects -v` (eg. 'count', 'in-pack', 'packs', 'size-pack'),
+            as integers. Sizes are in KiB. Objects borrowed through alternates are not counted.
+
+    Raises:
+        RuntimeError: `git count-objects` failed.
+    """
+    res = _git(['count-objects', '-v'], git_dir=git_dir)
+    if res.returncode != 0:
+        raise RuntimeError("Failed to count objects in '{}'. {}".format(git_dir, res.stderr))
+    counts = {}
+    for line in res.stdout.splitlines():
+        key, value = line.split(':', 1)
+        #Skips the 'alternate' lines (paths of borrowed object directories)
+        if value.strip().isdigit():
+            counts[key.strip()] = int(value.strip())
+    #END FOR
+    return counts
+#END DEF
+
+def repack_repository(git_dir:str, threads:int=None) -> tuple:
+    """Repacks a local repository into a single, bitmapped pack so that pushing it starts sending data sooner.
+
+    Arguments:
+        git_dir (str): The local (bare) repository directory.
+        threads (int): The most threads `git repack` may use. Default=min(REPACK_MAX_THREADS, number of CPUs)
+
+    Returns:
+        tuple: (before, after) The results of `_count_objects` before and after repacking.
+
+    Raises:
+        RuntimeError: `git repack` failed.
+
+    A reachability bitmap is written, which lets the following push skip most of its "Counting objects" phase.
+    Existing deltas are reused rather than recomputed, so the repack costs little more than rewriting the pack;
+    a full delta search (`-f`) on a large repository can take longer than the push time it saves.
+
+    The repository must not borrow objects through `objects/info/alternates` (see `_uses_alternates`):
+    `git repack -a` would copy every borrowed object into it.
+    """
+    if threads is None:
+        threads = min(REPACK_MAX_THREADS, os.cpu_count() or 1)
+    before = _count_objects(git_dir)
+    res = _git([
+        'repack', '-a', '-d', '-q',
+        '--write-bitmap-index',
+        '--threads={}'.format(threads),
+    ], git_dir=git_dir)
+    if res.returncode != 0:
+        raise RuntimeError("Failed to repack '{}'. {}".format(git_dir, res.stderr))
+    return before, _count_objects(git_dir)
+#END DEF
+
+def _uses_alternates(git_dir:str) -> bool:
+    """Checks whether a local repository borrows objects from another one (eg. a shared object store).
+
+    Arguments:
+        git_dir (str): The local (bare) repository directory.
+
+    Returns:
+        bool: True if the repository has a non-empty `objects/info/alternates` file.
+    """
+    alternates_path = os.path.join(git_dir, 'objects', 'info', 'alternates')
+    return os.path.isfile(alternates_path) and os.path.getsize(alternates_path) > 0
+#END DEF
+
+def _repack_and_report(git_dir:str, threads:int=None) -> None:
+    """Runs `repack_repository`, printing the object counts and pack sizes before and after.
+
+    Arguments:
+        git_dir (str): The local (bare) repository directory.
+        threads (int): The most threads `git repack` may use. Default=None (see `repack_repository`)
+
+    Returns:
+        None
+
+    A clone that borrows its objects from a shared object store is not repacked, since that would copy the
+    borrowed objects into it (and a bitmap can only be written for a pack holding every reachable object).
+    """
+    if _uses_alternates(git_dir):
+        vprint("----- Not repacking the clone, as its objects are borrowed from the shared object store.")
+        return
+    before, after = repack_repository(git_dir, threads=threads)
+    print("+++ Repacked clone: {} objects in {} pack(s), {:.1f} MiB --> {} objects in {} pack(s), {:.1f} MiB".format(
+        before['count'] + before['in-pack'], before['packs'], (before['size'] + before['size-pack']) / 1024,
+        after['count'] + after['in-pack'], after['packs'], (after['size'] + after['size-pack']) / 1024,
+    ))
+#END DEF
+
+def _push_to_destinations(git_dir:str, destination_clone_urls:list, destination_creds:list) -> bool:
+    """Pushes a local bare clone to every one of the destination repositories, in parallel.
+
+    Arguments:
+        git_dir (str): The local bare clone of the source repository.
+        destination_clone_urls (list): The full URLs to push the cloned repository to.
+        destination_creds (list): One set of credentials for each of `destination_clone_urls`.
+
+    Returns:
+        bool: True if the push to every destination succeeded. False if not.
+    """
+    with ThreadPoolExecutor(max_workers=len(destination_clone_urls)) as executor:
+        push_results = list(executor.map(
+            lambda dest: _push_mirror(git_dir, dest[0], dest[1]),
+            zip(destination_clone_urls, destination_creds),
+        ))
+    return all(push_results)
+#END DEF
+
+def _init_object_store(object_store:str) -> None:
+    """Creates the bare repository used as a shared object store, if it does not exist yet.
+
+    Arguments:
+        object_store (str): The directory of the shared object store.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: The object store could not be created.
+    """
+    with _object_store_lock:
+        if os.path.isdir(os.path.join(object_store, 'objects')):
+            return
+        res = _git(['init', '--bare', '--quiet', object_store])
+        if res.returncode != 0:
+            raise RuntimeError("Failed to create shared object store '{}'. {}".format(object_store, res.stderr))
+    #END WITH
+#END DEF
+
+def _add_to_object_store(object_store:str, git_dir:str, source_clone_url:str) -> None:
+    """Copies the objects of a local clone that are not in the shared object store yet into it.
+
+    Arguments:
+        object_store (str): The directory of the shared object store.
+        git_dir (str): The local clone, which uses the object store as an alternate.
+        source_clone_url (str): The URL the clone was made from. Its path names the refs kept in the store.
+
+    Returns:
+        None
+
+    The clone's refs are kept in the store under `refs/stores/<owner>/<repo>/`, so that its objects stay reachable
+    and so that later clones of related repositories advertise them to the server as objects they already have.
+    """
+    namespace = urlparse(source_clone_url).path.strip('/')
+    if namespace.endswith('.git'):
+        namespace = namespace[:-4]
+    with _object_store_lock:
+        res = _git(['fetch', '--quiet', '--no-tags', git_dir, '+refs/*:refs/stores/{}/*'.format(namespace)], git_dir=object_store)
+    if res.returncode != 0:
+        vprint("--- Failed to add '{}' to the shared object store | {}".format(namespace, res.stderr))
+#END DEF
+
+def _clone_source(source_clone_url:str, creds:tuple, object_store:str=None) -> str:
+    """Makes a bare clone of the source repository in a new temporary directory.
+
+    Arguments:
+        source_clone_url (str): The full URL to use when cloning the source repository.
+        creds (tuple): The credentials for the source repository.
+        object_store (str): The directory of a shared object store to clone with, if any. Default=None
+
+    Returns:
+        str: The temporary directory holding the clone. The caller is responsible for deleting it.
+
+    Raises:
+        RuntimeError: The source repository could not be cloned.
+
+    When an object store is given, the clone is made with `--reference-if-able` against it, so only the objects
+    the store does not already have are downloaded. The new objects are then added to the store for the next clone.
+    Pushes from the clone still send complete packs, because `git` reads the alternate objects while packing.
+    """
+    full_source_clone_url = _get_authenticated_url(source_clone_url, creds)
+    clone_args = ['clone', '--bare']
+    if object_store is not None:
+        _init_object_store(object_store)
+        clone_args += ['--reference-if-able', object_store]
+
+    temp_dir = tempfile.mkdtemp()
+    cmd_clone = _git(clone_args + [full_source_clone_url, temp_dir], capture=False)
+    if cmd_clone.returncode != 0:
+        shutil.rmtree(temp_dir)
+        raise RuntimeError("Failed to clone source repository.")
+    if object_store is not None:
+        _add_to_object_store(object_store, temp_dir, source_clone_url)
+    return temp_dir
+#END DEF
+
+def clone_repository(
+        source_clone_url:str, destination_clone_urls:list, all_creds:dict,
+        object_store:str=None, repack:bool=False, repack_threads:int=None,
+        lfs_cache:str=None, lfs_workers:int=8, wiki:bool=False
+) -> bool:
+    """Clones the source repository once, and pushes it to every one of the destination repositories.
+
+    Arguments:
+        source_clone_url (str): The full URL to use when cloning the source repository.
+        destination_clone_urls (list): The full URLs to push the cloned repository to.
         all_creds (dict): A dictionary containing the credentials for both the source and destination API.
+            `all_creds['dst']` is a list with one set of credentials for each of `destination_clone_urls`.
+        object_store (str): The directory of a shared object store to clone with (see `_clone_source`). Default=None
+        repack (bool): Whether to repack the clone before pushing it (see `repack_repository`). Default=False
+        repack_threads (int): The most threads `git repack` may use. Default=None
+        lfs_cache (str): If given, the LFS objects referenced by the repository are also copied to every destination,
+            using this directory as the local cache (see `movers.lfs.migrate_lfs_objects`). Default=None
+        lfs_workers (int): How many LFS objects may be transferred at the same time. Default=8
+        wiki (bool): Whether to also mirror the source repository's wiki (see `_mirror_wiki`). Default=False
 
     Returns:
-        bool: True if the cloned repo code/commits/etc. were successfully pushed to the destination. False if not.
+        bool: True if the cloned repo code/commits/etc. were successfully pushed to every destination. False if not.
+            A wiki that fails to mirror is reported, but does not make this False.
+
+    Raises:
+        RuntimeError: The source repository (or one of its LFS objects) could not be cloned.
+
+    The pushes to the destinations are run in parallel. The wiki is cloned and pushed on its own thread,
+    at the same time as the main repository.
     """
-    source_url_parts = urlparse(source_clone_url)
-    destination_url_parts = urlparse(destination_clone_url)
-
-    full_source_clone_url = (
-        source_url_parts.scheme + '://' +
-        all_creds['src'][0] + ':' + all_creds['src'][1] + '@' +
-        source_url_parts.netloc +
-        source_url_parts.path
-    )
-    full_destination_clone_url = (
-        destination_url_parts.scheme + '://' +
-        all_creds['dst'][0] + ':' + all_creds['dst'][1] + '@' +
-        destination_url_parts.netloc +
-        destination_url_parts.path
-    )
+    with ThreadPoolExecutor(max_workers=1) as wiki_executor:
+        wiki_future = None
+        if wiki:
+            wiki_future = wiki_executor.submit(_mirror_wiki, source_clone_url, destination_clone_urls, all_creds)
+        push_successful = _clone_and_push(
+            source_clone_url, destination_clone_urls, all_creds,
+            object_store, repack, repack_threads, lfs_cache, lfs_workers,
+        )
+        if wiki_future is not None and not wiki_future.result():
+            print("+++ Failed to mirror the source repository's wiki. Its first page may need to be created on the destination.")
+    #END WITH
+    return push_successful
+#END DEF
+
+def _wiki_clone_url(clone_url:str) -> str:
+    """Gets the clone URL of a repository's wiki.
+
+    Arguments:
+        clone_url (str): The URL of the repository, as given by the Github API (`clone_url`).
+
+    Returns:
+        str: The clone URL of the wiki (eg. `https://github.com/owner/repo.wiki.git`).
+    """
+    if clone_url.endswith('.git'):
+        clone_url = clone_url[:-4]
+    return clone_url + '.wiki.git'
+#END DEF
+
+def _mirror_wiki(source_clone_url:str, destination_clone_urls:list, all_creds:dict) -> bool:
+    """Clones the wiki of the source repository, and pushes it to the wiki of every destination repository.
+
+    Arguments:
+        source_clone_url (str): The URL of the source repository (not of its wiki).
+        destination_clone_urls (list): The URLs of the destination repositories (not of their wikis).
+        all_creds (dict): A dictionary containing the credentials for both the source and destination API.
+
+    Returns:
+        bool: True if the wiki was pushed to every destination, or if the source has no wiki to mirror. False if not.
+
+    A `git ls-remote` of the source wiki is done first; if it fails or lists no refs, the wiki is missing or empty
+    and nothing else is done.
+    """
+    full_source_wiki_url = _get_authenticated_url(_wiki_clone_url(source_clone_url), all_creds['src'])
+    probe = _git(['ls-remote', full_source_wiki_url])
+    if probe.returncode != 0 or not probe.stdout.strip():
+        vprint("----- Source repository's wiki is missing or empty. Skipping it.")
+        return True
 
-    current_directory = os.getcwd()
     temp_dir = tempfile.mkdtemp()
-    os.chdir(temp_dir)
+    try:
+        res = _git(['clone', '--bare', '--quiet', full_source_wiki_url, temp_dir])
+        if res.returncode != 0:
+            vprint("--- Wiki clone failed | {}".format(res.stderr))
+            return False
+        return _push_to_destinations(temp_dir, [_wiki_clone_url(url) for url in destination_clone_urls], all_creds['dst'])
+    finally:
+        shutil.rmtree(temp_dir)
+    #END TRY/FINALLY
+#END DEF
 
-    cmd_clone = os.system("git clone --bare {} .".format(full_source_clone_url))
-    if cmd_clone != 0:
-        raise RuntimeError("Failed to clone source repository.")
-    cmd_push = os.system("git push --mirror {}".format(full_destination_clone_url))
-    os.chdir(current_directory)
-    shutil.rmtree(temp_dir)
+def _clone_and_push(
+        source_clone_url:str, destination_clone_urls:list, all_creds:dict,
+        object_store:str, repack:bool, repack_threads:int, lfs_cache:str, lfs_workers:int
+) -> bool:
+    """Does the work of `clone_repository` for the main repository. See `clone_repository` for the arguments.
 
-    return cmd_push == 0
+    Returns:
+        bool: True if the cloned repo was successfully pushed to every destination. False if not.
+    """
+    temp_dir = _clone_source(source_clone_url, all_creds['src'], object_store=object_store)
+    try:
+        if repack:
+            _repack_and_report(temp_dir, threads=repack_threads)
+        if lfs_cache is not None:
+            lfs_stats = gitmover_lfs.migrate_lfs_objects(
+                temp_dir, source_clone_url, all_creds['src'], list(zip(destination_clone_urls, all_creds['dst'])),
+                lfs_cache, max_workers=lfs_workers,
+            )
+            print("+++ LFS objects: {found} found, {downloaded} downloaded, {uploaded} uploaded, {skipped} already at destination".format(**lfs_stats))
+        return _push_to_destinations(temp_dir, destination_clone_urls, all_creds['dst'])
+    finally:
+        shutil.rmtree(temp_dir)
+    #END TRY/FINALLY
 #END DEF
 
 # + + + + + + + + + + + + + + + + + + + + +
@@ -192,8 +591,8 @@ def create_branches(branches:list, repo:str, host:str, creds:tuple, **kwargs) ->
     """Creates Github data for Branches for the specified repository.
 
     Arguments:
-        branches (list): A list of dictionaries of special data for Branches on the specified repository.
-            The dictionaries should contain details about the repository's branches, branch protections, etc.
+        branches (list): A list of Branch records for the specified repository (see `download_branches`).
+            Only the protection of protected branches is created.
         repo (str): The full URL to use when cloning the source repository.
         host (str): The full URL to push the cloned repository to.
         creds (tuple): The credentials for authentication.
@@ -205,22 +604,22 @@ def create_branches(branches:list, repo:str, host:str, creds:tuple, **kwargs) ->
         RuntimeError: The call to create the specified data on the Github repository failed in an unexpected way
     """
     for br in branches:
-        if not br['protected']:
+        if not br.protected or br.protection is None:
             continue
-        uri ="repos/{}/branches/{}/protection".format(repo, br['name'])
+        uri ="repos/{}/branches/{}/protection".format(repo, br.name)
         try:
             res = gitmover_api.do_send(
                 'PUT', host, uri, creds,
                 data={
                     #objects
-                    'required_status_checks': br['details']['required_status_checks'],
-                    'required_pull_request_reviews': br['details']['required_pull_request_reviews'],
-                    'restrictions': br['details']['restrictions'],
+                    'required_status_checks': br.protection.required_status_checks,
+                    'required_pull_request_reviews': br.protection.required_pull_request_reviews,
+                    'restrictions': br.protection.restrictions,
                     #booleans
-                    'allow_force_pushes': br['details']['protection']['allow_force_pushes']['enabled'],
-                    'allow_deletions': br['details']['protection']['allow_deletions']['enabled'],
-                    'enforce_admins': br['details']['protection']['enforce_admins']['enabled'],
-                    'required_linear_history': br['details']['protection']['required_linear_history']['enabled'],
+                    'allow_force_pushes': br.protection.allow_force_pushes,
+                    'allow_deletions': br.protection.allow_deletions,
+                    'enforce_admins': br.protection.enforce_admins,
+                    'required_linear_history': br.protection.required_linear_history,
                     'required_conversation_resolution': False,
                 },
             )
@@ -229,7 +628,7 @@ def create_branches(branches:list, repo:str, host:str, creds:tuple, **kwargs) ->
             if api_res.status_code == 422:
                 vprint(
                     "--- API Response from `POST` to `{}` gave HTTP response code 422. ".format(uri) +
-                    "The data for branch '{}' was invalid.".format(br['name'])
+                    "The data for branch '{}' was invalid.".format(br.name)
                 )
                 return False
             else:
@@ -242,8 +641,7 @@ def create_deploy_keys(deploy_keys:list, repo:str, host:str, creds:tuple, **kwar
     """Creates Deploy Keys for the specified repository.
 
     Arguments:
-        deploy_keys (list): A list of Deploy Keys to create on the specified repository.
-            The list should contain dictionaries with the details to send to the `/keys` API endpoint.
+        deploy_keys (list): A list of DeployKey records to create on the specified repository.
         repo (str): The full URL to use when cloning the source repository.
         host (str): The full URL to push the cloned repository to.
         creds (tuple): The credentials for authentication.
@@ -260,9 +658,9 @@ def create_deploy_keys(deploy_keys:list, repo:str, host:str, creds:tuple, **kwar
             res = gitmover_api.do_send(
                 'POST', host, uri, creds, do_wait=True,
                 data={
-                    'title': dk['title'],
-                    'key': dk['key'],
-                    'read_only': dk['read_only'],
+                    'title': dk.title,
+                    'key': dk.key,
+                    'read_only': dk.read_only,
                 },
             )
         except (GitMoverApiCallError) as e:
@@ -270,7 +668,7 @@ def create_deploy_keys(deploy_keys:list, repo:str, host:str, creds:tuple, **kwar
             if api_res.status_code == 422:
                 vprint(
                     "--- API Response from `POST` to `{}` gave HTTP response code 422. ".format(uri) +
-                    "The deploy key '{}' was invalid.".format(dk['title'])
+                    "The deploy key '{}' was invalid.".format(dk.title)
                 )
                 return False
             else:
@@ -284,8 +682,7 @@ def create_releases(releases:list, repo:str, host:str, creds:tuple, **kwargs) ->
     """Creates Releases for the specified repository.
 
     Arguments:
-        releases (list): A list of Releases to create on the specified repository.
-            The list should contain dictionaries with the details to send to the `/releases` API endpoint.
+        releases (list): A list of Release records to create on the specified repository.
         repo (str): The full URL to use when cloning the source repository.
         host (str): The full URL to push the cloned repository to.
         creds (tuple): The credentials for authentication.
@@ -302,12 +699,12 @@ def create_releases(releases:list, repo:str, host:str, creds:tuple, **kwargs) ->
             res = gitmover_api.do_send(
                 'POST', host, uri, creds, do_wait=True,
                 data={
-                    'tag_name': rl['tag_name'],
-                    'target_commitish': rl['target_commitish'],
-                    'name': rl['name'],
-                    'body': rl['body'],
-                    'draft': rl['draft'],
-                    'prerelease': rl['prerelease'],
+                    'tag_name': rl.tag_name,
+                    'target_commitish': rl.target_commitish,
+                    'name': rl.name,
+                    'body': rl.body,
+                    'draft': rl.draft,
+                    'prerelease': rl.prerelease,
                 },
             )
         except (GitMoverApiCallError) as e:
@@ -315,7 +712,7 @@ def create_releases(releases:list, repo:str, host:str, creds:tuple, **kwargs) ->
             if api_res.status_code == 422:
                 vprint(
                     "--- API Response from `POST` to `{}` gave HTTP response code 422. ".format(uri) +
-                    "The release '{} ({})' was invalid.".format(rl['name'], rl['tag_name'])
+                    "The release '{} ({})' was invalid.".format(rl.name, rl.tag_name)
                 )
                 return False
             else: